@@ -0,0 +1,144 @@
+"""
+Times the fetch and transform hot paths against synthetic channels of increasing size.
+
+Each run appends one record to benchmark_results.json so results can be compared
+across changes. The YouTube API is replaced by FakeYouTube (see synthetic_data.py), so
+no credentials or network access are needed; use --latency to simulate round trips.
+
+    uv run benchmark.py                      # 1k, 10k and 100k videos, 1k playlists
+    uv run benchmark.py --sizes 1000 --latency 0.05
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import fetch_videos
+from make_simple_video_list import build_membership_lookup, simplify_video
+from synthetic_data import UPLOADS_PLAYLIST_ID, FakeYouTube, make_channel
+
+HERE = Path(__file__).parent
+RESULTS_FILE = HERE / "benchmark_results.json"
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_PLAYLISTS = 1_000
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def traced_peak_mib(fn, *args):
+    """Peak memory allocated while running fn, as reported by tracemalloc."""
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def peak_rss_mib():
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=HERE, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(num_videos, num_playlists, latency):
+    """Benchmark every stage for one channel size; return timings and transform peak memory."""
+    channel = make_channel(num_videos, num_playlists)
+    youtube = FakeYouTube(channel, latency=latency)
+    timings = {}
+
+    video_ids, timings["get_all_video_ids"] = timed(
+        fetch_videos.get_all_video_ids, youtube, UPLOADS_PLAYLIST_ID
+    )
+    videos, timings["get_video_details"] = timed(fetch_videos.get_video_details, youtube, video_ids)
+    playlists, timings["get_all_playlists"] = timed(fetch_videos.get_all_playlists, youtube)
+    memberships, timings["get_playlist_memberships"] = timed(
+        fetch_videos.get_playlist_memberships, youtube, playlists
+    )
+    # Round-trip through JSON, as the transform sees the data when reading it from disk.
+    raw_videos, timings["serialize_raw"] = timed(lambda: json.dumps(videos, indent=2))
+    raw_playlists = json.dumps({"playlists": playlists, "memberships": memberships}, indent=2)
+    videos, timings["parse_raw"] = timed(json.loads, raw_videos)
+    playlists_full = json.loads(raw_playlists)
+
+    lookup, timings["build_membership_lookup"] = timed(build_membership_lookup, playlists_full)
+
+    def simplify_all():
+        return [simplify_video(item, lookup) for item in videos]
+
+    simplified, timings["simplify_video"] = timed(simplify_all)
+    _, timings["serialize_simplified"] = timed(lambda: json.dumps(simplified, indent=2))
+
+    peak_mib = {
+        "build_membership_lookup": traced_peak_mib(build_membership_lookup, playlists_full),
+        "simplify_video": traced_peak_mib(simplify_all),
+    }
+
+    return {
+        "videos": num_videos,
+        "playlists": num_playlists,
+        "memberships": len(memberships),
+        "requests": youtube.request_count,
+        "seconds": {stage: round(t, 4) for stage, t in timings.items()},
+        "peak_mib": {stage: round(m, 2) for stage, m in peak_mib.items()},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="number of videos per synthetic channel")
+    parser.add_argument("--playlists", type=int, default=DEFAULT_PLAYLISTS)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="simulated seconds per API request")
+    parser.add_argument("--output", type=Path, default=RESULTS_FILE)
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes:
+        print(f"Benchmarking {size} videos, {args.playlists} playlists...")
+        result = run_size(size, args.playlists, args.latency)
+        for stage, seconds in result["seconds"].items():
+            print(f"  {stage:<26} {seconds:>9.4f}s")
+        for stage, mib in result["peak_mib"].items():
+            print(f"  {stage:<26} {mib:>9.2f} MiB peak")
+        results.append(result)
+
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "latency": args.latency,
+        "peak_rss_mib": round(peak_rss_mib(), 1),
+        "results": results,
+    }
+    history = json.loads(args.output.read_text()) if args.output.exists() else []
+    history.append(run)
+    args.output.write_text(json.dumps(history, indent=2))
+    print(f"Appended results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
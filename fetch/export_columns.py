@@ -0,0 +1,207 @@
+"""
+Writes a columnar export of the raw catalog for analytics: one packed binary file per
+column, plus schema.json describing them. Columns can be memory-mapped and queried
+without re-parsing videos_full.json, e.g. with numpy:
+
+    views = numpy.memmap("columns/videos.viewCount.bin", dtype="<i8", mode="r")
+
+or without numpy via load_table() below.
+
+Tables:
+  videos       one row per video, in videos_full.json order
+  playlists    one row per playlist
+  memberships  one row per (video, playlist) pair, as row indexes into the tables above
+
+Column types:
+  int64 / int32  little-endian fixed-width integers in <table>.<column>.bin
+  category       uint8 codes in <table>.<column>.bin; labels listed in schema.json
+  string         UTF-8 bytes in <table>.<column>.data.bin, with n + 1 int64 start
+                 offsets in <table>.<column>.offsets.bin
+"""
+
+import json
+import mmap
+import re
+import sys
+from array import array
+from datetime import datetime
+from pathlib import Path
+
+HERE = Path(__file__).parent
+VIDEOS_FULL_FILE = HERE / "videos_full.json"
+PLAYLISTS_FULL_FILE = HERE / "playlists_full.json"
+COLUMNS_DIR = HERE / "columns"
+
+EXPORT_FORMAT = 1
+TYPECODES = {"int64": "q", "int32": "i", "category": "B"}
+
+DURATION_RE = re.compile(r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?")
+
+
+def parse_duration(value):
+    """Return the number of seconds in an ISO 8601 duration such as "PT1H2M3S" (0 if absent)."""
+    match = DURATION_RE.fullmatch(value or "")
+    if not match:
+        return 0
+    days, hours, minutes, seconds = (int(g or 0) for g in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def parse_timestamp(value):
+    """Return Unix seconds for an API datetime string such as "2024-01-15T10:00:00Z"."""
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+def build_tables(videos_full, playlists_full):
+    """Return {table: {column: (type, values, categories)}} from the raw API data."""
+    playlists = playlists_full["playlists"]
+    playlist_index = {p["id"]: i for i, p in enumerate(playlists)}
+    video_index = {item["id"]: i for i, item in enumerate(videos_full)}
+    privacy_categories = ["public", "unlisted", "private"]
+    privacy_codes = {label: i for i, label in enumerate(privacy_categories)}
+
+    videos = {
+        "id": ("string", [], None),
+        "title": ("string", [], None),
+        "publishedAt": ("int64", array("q"), None),
+        "durationSeconds": ("int64", array("q"), None),
+        "viewCount": ("int64", array("q"), None),
+        "likeCount": ("int64", array("q"), None),
+        "commentCount": ("int64", array("q"), None),
+        "privacyStatus": ("category", array("B"), privacy_categories),
+    }
+    for item in videos_full:
+        snippet = item["snippet"]
+        statistics = item.get("statistics", {})
+        videos["id"][1].append(item["id"])
+        videos["title"][1].append(snippet["title"])
+        videos["publishedAt"][1].append(parse_timestamp(snippet["publishedAt"]))
+        videos["durationSeconds"][1].append(
+            parse_duration(item.get("contentDetails", {}).get("duration"))
+        )
+        videos["viewCount"][1].append(int(statistics.get("viewCount", 0)))
+        videos["likeCount"][1].append(int(statistics.get("likeCount", 0)))
+        videos["commentCount"][1].append(int(statistics.get("commentCount", 0)))
+        videos["privacyStatus"][1].append(privacy_codes[item["status"]["privacyStatus"]])
+
+    memberships = {
+        "videoRow": ("int32", array("i"), None),
+        "playlistRow": ("int32", array("i"), None),
+    }
+    for m in playlists_full["memberships"]:
+        # Skip rows pointing at videos or playlists outside this export (e.g. other channels).
+        video_row = video_index.get(m["video_id"])
+        playlist_row = playlist_index.get(m["playlist_id"])
+        if video_row is None or playlist_row is None:
+            continue
+        memberships["videoRow"][1].append(video_row)
+        memberships["playlistRow"][1].append(playlist_row)
+
+    return {
+        "videos": videos,
+        "playlists": {
+            "id": ("string", [p["id"] for p in playlists], None),
+            "title": ("string", [p["snippet"]["title"] for p in playlists], None),
+        },
+        "memberships": memberships,
+    }
+
+
+def _little_endian(values):
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def write_export(videos_full, playlists_full, directory=COLUMNS_DIR):
+    directory.mkdir(exist_ok=True)
+    schema = {"format": EXPORT_FORMAT, "tables": {}}
+    for table, columns in build_tables(videos_full, playlists_full).items():
+        table_schema = {"rows": 0, "columns": {}}
+        for column, (kind, values, categories) in columns.items():
+            stem = directory / f"{table}.{column}"
+            if kind == "string":
+                encoded = [value.encode() for value in values]
+                offsets = array("q", [0])
+                for data in encoded:
+                    offsets.append(offsets[-1] + len(data))
+                Path(f"{stem}.data.bin").write_bytes(b"".join(encoded))
+                Path(f"{stem}.offsets.bin").write_bytes(_little_endian(offsets).tobytes())
+            else:
+                Path(f"{stem}.bin").write_bytes(_little_endian(values).tobytes())
+            column_schema = {"type": kind}
+            if categories is not None:
+                column_schema["categories"] = categories
+            table_schema["columns"][column] = column_schema
+            table_schema["rows"] = len(values)
+        schema["tables"][table] = table_schema
+    (directory / "schema.json").write_text(json.dumps(schema, indent=2))
+    return schema
+
+
+class StringColumn:
+    """Read-only sequence of strings decoded lazily from memory-mapped offsets and data."""
+
+    def __init__(self, offsets, data):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return bytes(self._data[self._offsets[i] : self._offsets[i + 1]]).decode()
+
+
+def _map(path, typecode):
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return memoryview(array(typecode))
+        # The mapping stays alive as long as the returned memoryview does.
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    return view if typecode == "B" else view.cast(typecode)
+
+
+def load_table(table, directory=COLUMNS_DIR):
+    """
+    Return {column: sequence} for one exported table, memory-mapped rather than read.
+    Numeric and category columns are memoryviews (category values are codes into the
+    schema's labels); string columns are StringColumn objects. Assumes a little-endian host.
+    """
+    schema = json.loads((directory / "schema.json").read_text())
+    if schema["format"] != EXPORT_FORMAT:
+        raise ValueError(f"Unsupported export format {schema['format']} in {directory}")
+    columns = {}
+    for column, column_schema in schema["tables"][table]["columns"].items():
+        stem = directory / f"{table}.{column}"
+        if column_schema["type"] == "string":
+            columns[column] = StringColumn(
+                _map(f"{stem}.offsets.bin", "q"), _map(f"{stem}.data.bin", "B")
+            )
+        else:
+            columns[column] = _map(f"{stem}.bin", TYPECODES[column_schema["type"]])
+    return columns
+
+
+def main():
+    for path in (VIDEOS_FULL_FILE, PLAYLISTS_FULL_FILE):
+        if not path.exists():
+            raise FileNotFoundError(
+                f"Input file not found: {path}\n"
+                "Run `uv run fetch_videos.py` first."
+            )
+    videos_full = json.loads(VIDEOS_FULL_FILE.read_text())
+    playlists_full = json.loads(PLAYLISTS_FULL_FILE.read_text())
+    schema = write_export(videos_full, playlists_full, COLUMNS_DIR)
+    rows = ", ".join(f"{t['rows']} {name}" for name, t in schema["tables"].items())
+    print(f"Wrote columnar export ({rows}) → {COLUMNS_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Local stand-in for the YouTube Data API v3, serving a synthetic channel over HTTP.
+
+Implements the `channels`, `playlists`, `playlistItems` and `videos` list endpoints
+used by fetch_videos.py, with real pagination, ETags (`If-None-Match` → 304) and
+optional fault injection: per-request latency, a quota budget after which every
+request fails with 403 `quotaExceeded`, and a random rate of 503 `backendError`s.
+
+    uv run fake_youtube_server.py --videos 10000 --playlists 200 --latency 0.05
+    YOUTUBE_API_URL=http://127.0.0.1:8080/youtube/v3/ uv run fetch_videos.py
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock
+from urllib.parse import parse_qs, urlparse
+
+from synthetic_data import FakeYouTube, make_channel
+
+DEFAULT_PORT = 8080
+
+
+def error_body(code, reason, message, domain="youtube.api"):
+    return {
+        "error": {
+            "code": code,
+            "message": message,
+            "errors": [{"message": message, "domain": domain, "reason": reason}],
+        }
+    }
+
+
+class FakeYouTubeServer(ThreadingHTTPServer):
+    """HTTP server holding the synthetic dataset, fault-injection settings and counters."""
+
+    daemon_threads = True
+
+    def __init__(self, address, channel, latency=0.0, quota=None, error_rate=0.0, seed=0):
+        super().__init__(address, _Handler)
+        self.api = FakeYouTube(channel)
+        self.latency = latency
+        self.quota = quota
+        self.error_rate = error_rate
+        self.request_count = 0
+        self.quota_used = 0
+        self._rng = random.Random(seed)
+        self._lock = Lock()
+
+    @property
+    def api_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/youtube/v3/"
+
+    def handlers(self):
+        return {
+            "channels": self.api.list_channels,
+            "playlists": self.api.list_playlists,
+            "playlistItems": self.api.list_playlist_items,
+            "videos": self.api.list_videos,
+        }
+
+    def admit(self):
+        """Count a request against the quota; return an injected (status, body) failure or None."""
+        with self._lock:
+            self.request_count += 1
+            if self.quota is not None and self.quota_used >= self.quota:
+                return 403, error_body(
+                    403, "quotaExceeded",
+                    "The request cannot be completed because you have exceeded your quota.",
+                    domain="youtube.quota",
+                )
+            # Every list call costs one quota unit, as in the real API.
+            self.quota_used += 1
+            if self.error_rate and self._rng.random() < self.error_rate:
+                return 503, error_body(503, "backendError", "Backend Error", domain="global")
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeYouTubeServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        endpoint = url.path.rstrip("/").rsplit("/", 1)[-1]
+        handler = self.server.handlers().get(endpoint)
+        if handler is None:
+            self._send(404, error_body(404, "notFound", f"Unknown endpoint: {endpoint}"))
+            return
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        failure = self.server.admit()
+        if failure:
+            self._send(*failure)
+            return
+
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if "maxResults" in params:
+            params["maxResults"] = int(params["maxResults"])
+        params.pop("key", None)
+        params.pop("alt", None)
+        response = {"kind": f"youtube#{endpoint}ListResponse", **handler(**params)}
+
+        etag = '"' + hashlib.sha1(json.dumps(response).encode()).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self._send(200, {"etag": etag, **response}, etag=etag)
+
+    def _send(self, status, payload, etag=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--videos", type=int, default=1_000)
+    parser.add_argument("--playlists", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds to wait before answering each request")
+    parser.add_argument("--quota", type=int, default=None,
+                        help="number of requests allowed before returning 403 quotaExceeded")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of requests that fail with 503 backendError")
+    args = parser.parse_args(argv)
+
+    channel = make_channel(args.videos, args.playlists, seed=args.seed)
+    server = FakeYouTubeServer(
+        (args.host, args.port), channel,
+        latency=args.latency, quota=args.quota, error_rate=args.error_rate, seed=args.seed,
+    )
+    print(f"Serving {args.videos} videos and {args.playlists} playlists at {server.api_url}")
+    print(f"Point the fetch scripts at it with: YOUTUBE_API_URL={server.api_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from google.auth.credentials import AnonymousCredentials
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
@@ -12,18 +17,92 @@ TOKEN_FILE = HERE / "token.json"
 OUTPUT_FILE = HERE / "videos_full.json"
 PLAYLISTS_FILE = HERE / "playlists_full.json"
 
+# Base URL of an alternative API server, e.g. fake_youtube_server.py for offline testing.
+API_URL = os.environ.get("YOUTUBE_API_URL")
+
+
+# Refresh the access token this long before it expires, so no request races its expiry.
+REFRESH_MARGIN = timedelta(minutes=5)
+
+
+def write_atomic(path, text):
+    """Write via a temporary file and rename, so readers never see a partially written file."""
+    with tempfile.NamedTemporaryFile(
+        "w", dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    ) as f:
+        f.write(text)
+    os.replace(f.name, path)
+
+
+class CredentialManager:
+    """
+    Loads the OAuth credentials once and shares them across every API client and thread.
+
+    The credentials are refreshed ahead of expiry, one refresh at a time behind a lock,
+    and each refreshed token is written back to the token file atomically. The shared
+    credentials object's own `refresh` is routed through the same lock, so the automatic
+    refreshes google-auth performs mid-request are serialized too: when several workers
+    find the token expired at once, the first refreshes and the rest reuse its token.
+    """
+
+    def __init__(self, token_file, refresh_margin=REFRESH_MARGIN):
+        self.token_file = token_file
+        self.refresh_margin = refresh_margin
+        self._lock = threading.RLock()
+        self._creds = None
+        self._refresh = None
+
+    def credentials(self):
+        with self._lock:
+            if self._creds is None:
+                self._creds = self._load()
+            if self._needs_refresh():
+                self._creds.refresh(Request())
+            return self._creds
+
+    def _load(self):
+        if not self.token_file.exists():
+            raise FileNotFoundError(
+                f"Token file not found: {self.token_file}\n"
+                "Run `uv run login.py` locally first to generate token.json."
+            )
+        creds = Credentials.from_authorized_user_file(self.token_file, SCOPES)
+        self._refresh = creds.refresh
+        creds.refresh = self._locked_refresh
+        return creds
+
+    def _needs_refresh(self):
+        creds = self._creds
+        if not creds.refresh_token:
+            return False
+        if not creds.valid:
+            return bool(creds.expired)
+        # google-auth stores expiry as a naive UTC datetime.
+        expiry = creds.expiry
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return isinstance(expiry, datetime) and expiry - self.refresh_margin <= now
+
+    def _locked_refresh(self, request):
+        with self._lock:
+            if self._creds.valid and not self._needs_refresh():
+                return  # another worker has already refreshed the token
+            self._refresh(request)
+            write_atomic(self.token_file, self._creds.to_json())
+
 
 def get_credentials():
-    if not TOKEN_FILE.exists():
-        raise FileNotFoundError(
-            f"Token file not found: {TOKEN_FILE}\n"
-            "Run `uv run login.py` locally first to generate token.json."
+    if API_URL:
+        return AnonymousCredentials()
+    return CredentialManager(TOKEN_FILE).credentials()
+
+
+def build_client(creds):
+    if API_URL:
+        return build(
+            "youtube", "v3", credentials=creds,
+            client_options={"api_endpoint": API_URL}, static_discovery=True,
         )
-    creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
-    if not creds.valid and creds.expired and creds.refresh_token:
-        creds.refresh(Request())
-        TOKEN_FILE.write_text(creds.to_json())
-    return creds
+    return build("youtube", "v3", credentials=creds)
 
 
 def get_uploads_playlist_id(youtube):
@@ -31,31 +110,52 @@ def get_uploads_playlist_id(youtube):
     return response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
 
 
-def get_all_video_ids(youtube, playlist_id):
-    video_ids = []
+def iter_playlist_items(youtube, playlist_id, part="contentDetails"):
+    """Yield the raw items of a playlist in playlist order, fetching one page at a time."""
     next_page_token = None
     while True:
-        params = {"playlistId": playlist_id, "part": "contentDetails", "maxResults": 50}
+        params = {"playlistId": playlist_id, "part": part, "maxResults": 50}
         if next_page_token:
             params["pageToken"] = next_page_token
         response = youtube.playlistItems().list(**params).execute()
-        for item in response["items"]:
-            video_ids.append(item["contentDetails"]["videoId"])
+        yield from response["items"]
         next_page_token = response.get("nextPageToken")
         if not next_page_token:
             break
+
+
+def get_all_video_ids(youtube, playlist_id, stop_at=None):
+    """
+    Return the video IDs in a playlist, in playlist order.
+
+    If `stop_at` (a set of IDs) is given, paging stops at the first ID found in it and
+    only the IDs before it are returned. The uploads playlist is ordered newest first,
+    so passing the already-known IDs yields just the new uploads.
+    """
+    video_ids = []
+    for item in iter_playlist_items(youtube, playlist_id):
+        video_id = item["contentDetails"]["videoId"]
+        if stop_at and video_id in stop_at:
+            break
+        video_ids.append(video_id)
     return video_ids
 
 
-def get_video_details(youtube, video_ids):
-    all_videos = []
+def iter_video_details(youtube, video_ids):
+    """Yield raw video objects one batch (of up to 50) at a time, as each response arrives."""
     for i in range(0, len(video_ids), 50):
         batch = video_ids[i : i + 50]
         response = youtube.videos().list(
             id=",".join(batch),
             part="snippet,contentDetails,statistics,status",
         ).execute()
-        all_videos.extend(response["items"])
+        yield response["items"]
+
+
+def get_video_details(youtube, video_ids):
+    all_videos = []
+    for items in iter_video_details(youtube, video_ids):
+        all_videos.extend(items)
     return all_videos
 
 
@@ -78,41 +178,27 @@ def get_all_playlists(youtube):
 def get_playlist_memberships(youtube, playlists):
     """
     For each playlist, fetch all its items and return a flat list of membership rows:
-      [{"playlist_id": ..., "playlist_title": ..., "video_id": ...}, ...]
+      [{"playlist_id": ..., "video_id": ...}, ...]
+
+    Rows are normalized: titles live only in the playlist objects and are joined in by
+    make_simple_video_list.build_membership_lookup. Only `part=contentDetails` is
+    requested, since it carries the video ID; items without one are skipped.
 
     Uses Strategy B (iterate by playlist, not by video) to minimise quota usage.
     """
     memberships = []
     for playlist in playlists:
         playlist_id = playlist["id"]
-        playlist_title = playlist["snippet"]["title"]
-        next_page_token = None
-        while True:
-            params = {
-                "playlistId": playlist_id,
-                "part": "snippet",
-                "maxResults": 50,
-            }
-            if next_page_token:
-                params["pageToken"] = next_page_token
-            response = youtube.playlistItems().list(**params).execute()
-            for item in response["items"]:
-                resource = item["snippet"]["resourceId"]
-                if resource.get("kind") == "youtube#video":
-                    memberships.append({
-                        "playlist_id": playlist_id,
-                        "playlist_title": playlist_title,
-                        "video_id": resource["videoId"],
-                    })
-            next_page_token = response.get("nextPageToken")
-            if not next_page_token:
-                break
+        for item in iter_playlist_items(youtube, playlist_id):
+            video_id = item.get("contentDetails", {}).get("videoId")
+            if video_id:
+                memberships.append({"playlist_id": playlist_id, "video_id": video_id})
     return memberships
 
 
 def main():
     creds = get_credentials()
-    youtube = build("youtube", "v3", credentials=creds)
+    youtube = build_client(creds)
 
     print("Fetching channel info...")
     uploads_playlist_id = get_uploads_playlist_id(youtube)
@@ -0,0 +1,168 @@
+"""
+Compares videos.json against the previous build and writes manifest.json plus a chain
+of delta patches under deltas/, so returning gallery clients can update their cached
+copy without downloading the whole catalog again.
+
+Records are matched by video ID and compared by content hash. The catalog version is
+a hash of the whole catalog, so it can be recomputed from any previous videos.json
+without keeping extra state between runs. The previous build's manifest and deltas are
+carried forward, so a client that last visited up to MAX_DELTAS builds ago can catch
+up by applying each delta in turn.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+HERE = Path(__file__).parent
+OUTPUT_FILE = HERE / "videos.json"
+PREVIOUS_FILE = HERE / "videos_previous.json"
+MANIFEST_FILE = HERE / "manifest.json"
+PREVIOUS_MANIFEST_FILE = HERE / "manifest_previous.json"
+DELTAS_DIR = HERE / "deltas"
+
+MANIFEST_FORMAT = 2
+# Two weeks of daily builds.
+MAX_DELTAS = 14
+# Changes on nearly every build; when it is the only change to a record, the new value
+# is shipped in the delta's compact `views` map instead of as a whole record.
+VIEW_FIELD = "viewCount"
+
+
+def content_hash(video):
+    """Stable hash of one simplified video record."""
+    encoded = json.dumps(video, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(encoded.encode()).hexdigest()[:16]
+
+
+def catalog_hashes(videos):
+    """Return {video_id: content_hash} for a list of simplified videos."""
+    return {video["id"]: content_hash(video) for video in videos}
+
+
+def catalog_version(hashes):
+    """Hash of a whole catalog, independent of record order."""
+    digest = hashlib.sha1()
+    for video_id in sorted(hashes):
+        digest.update(f"{video_id}:{hashes[video_id]}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def _without_views(video):
+    return {key: value for key, value in video.items() if key != VIEW_FIELD}
+
+
+def compute_delta(previous, current, previous_hashes=None, current_hashes=None):
+    """
+    Return {"added": [...], "changed": [...], "views": {video_id: viewCount},
+    "removed": [video_id, ...]} describing how to turn `previous` into `current`.
+
+    Records whose only change is their view count appear in `views`; other added and
+    changed entries are full records, in the order they appear in `current`.
+    """
+    if previous_hashes is None:
+        previous_hashes = catalog_hashes(previous)
+    if current_hashes is None:
+        current_hashes = catalog_hashes(current)
+    previous_by_id = {video["id"]: video for video in previous}
+
+    added = []
+    changed = []
+    views = {}
+    for video in current:
+        old_hash = previous_hashes.get(video["id"])
+        if old_hash is None:
+            added.append(video)
+        elif old_hash != current_hashes[video["id"]]:
+            if _without_views(previous_by_id[video["id"]]) == _without_views(video):
+                views[video["id"]] = video[VIEW_FIELD]
+            else:
+                changed.append(video)
+    removed = [video_id for video_id in previous_hashes if video_id not in current_hashes]
+    return {"added": added, "changed": changed, "views": views, "removed": removed}
+
+
+def carried_deltas(previous_manifest, previous_version):
+    """
+    Return the previous build's delta entries that can still be offered: a contiguous
+    chain ending at `previous_version` whose files are present in DELTAS_DIR.
+    """
+    if not previous_manifest or previous_manifest.get("format") != MANIFEST_FORMAT:
+        return []
+    chain = []
+    expected_to = previous_version
+    for entry in reversed(previous_manifest["deltas"]):
+        if entry["to"] != expected_to or not (DELTAS_DIR / Path(entry["file"]).name).exists():
+            break
+        chain.append(entry)
+        expected_to = entry["from"]
+    return chain[::-1]
+
+
+def main():
+    if not OUTPUT_FILE.exists():
+        raise FileNotFoundError(
+            f"Input file not found: {OUTPUT_FILE}\n"
+            "Run `uv run make_simple_video_list.py` first."
+        )
+
+    current = json.loads(OUTPUT_FILE.read_text())
+    current_hashes = catalog_hashes(current)
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "version": catalog_version(current_hashes),
+        "count": len(current),
+        "deltas": [],
+    }
+
+    if PREVIOUS_FILE.exists():
+        previous = json.loads(PREVIOUS_FILE.read_text())
+        previous_hashes = catalog_hashes(previous)
+        previous_version = catalog_version(previous_hashes)
+        previous_manifest = (
+            json.loads(PREVIOUS_MANIFEST_FILE.read_text())
+            if PREVIOUS_MANIFEST_FILE.exists()
+            else None
+        )
+        manifest["deltas"] = carried_deltas(previous_manifest, previous_version)
+        if previous_version != manifest["version"]:
+            delta = {
+                "from": previous_version,
+                "to": manifest["version"],
+                **compute_delta(previous, current, previous_hashes, current_hashes),
+            }
+            DELTAS_DIR.mkdir(exist_ok=True)
+            delta_file = DELTAS_DIR / f"{previous_version}.json"
+            delta_file.write_text(json.dumps(delta, indent=2))
+            manifest["deltas"].append({
+                "from": previous_version,
+                "to": manifest["version"],
+                "file": f"{DELTAS_DIR.name}/{delta_file.name}",
+            })
+            print(
+                f"Wrote delta {previous_version} → {manifest['version']} "
+                f"({len(delta['added'])} added, {len(delta['changed'])} changed, "
+                f"{len(delta['views'])} view counts, {len(delta['removed'])} removed) → {delta_file}"
+            )
+        else:
+            print("Catalog unchanged since previous build; no new delta written.")
+    else:
+        print(f"No previous build at {PREVIOUS_FILE}; clients will fetch the full catalog.")
+
+    manifest["deltas"] = manifest["deltas"][-MAX_DELTAS:]
+    # Drop delta files that are no longer part of the chain.
+    keep = {Path(entry["file"]).name for entry in manifest["deltas"]}
+    if DELTAS_DIR.exists():
+        for path in DELTAS_DIR.glob("*.json"):
+            if path.name not in keep:
+                path.unlink()
+
+    MANIFEST_FILE.write_text(json.dumps(manifest, indent=2))
+    print(
+        f"Wrote manifest version {manifest['version']} with {len(manifest['deltas'])} "
+        f"deltas → {MANIFEST_FILE}"
+    )
+
+
+if __name__ == "__main__":
+    main()
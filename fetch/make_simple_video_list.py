@@ -4,24 +4,60 @@ See MAPPINGS.md for the full field mapping reference.
 """
 
 import json
+import os
+import re
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import export_columns
+
 HERE = Path(__file__).parent
 VIDEOS_FULL_FILE = HERE / "videos_full.json"
 PLAYLISTS_FULL_FILE = HERE / "playlists_full.json"
 OUTPUT_FILE = HERE / "videos.json"
 PRIVATE_FILE = HERE / "videos_private.json"
 
+# Number of processes used to simplify videos; 0 means one per CPU core.
+WORKERS = int(os.environ.get("SIMPLIFY_WORKERS", "1"))
+# Below this many videos a process pool costs more than it saves.
+PARALLEL_THRESHOLD = 5_000
+
+DETAILS_DIR = HERE / "details"
+
+# "full" writes complete records to videos.json. "slim" writes list-view records there
+# (truncated description, one thumbnail) and each public video's complete record to
+# details/<id>.json, which the gallery's video page loads on demand.
+PROJECTION = os.environ.get("OUTPUT_PROJECTION", "full")
+LIST_DESCRIPTION_LENGTH = 200
+# Links are left out of a truncated description's searchText; nobody searches by URL.
+URL_PATTERN = re.compile(r"https?://\S+")
+
+# Set EXPORT_COLUMNS=1 to also write the columnar analytics export (see export_columns.py).
+EXPORT_COLUMNS = os.environ.get("EXPORT_COLUMNS") == "1"
+
 
 def build_membership_lookup(playlists_full):
-    """Return {video_id: [{"id": playlist_id, "title": playlist_title}, ...]}."""
+    """
+    Return {video_id: [{"id": playlist_id, "title": playlist_title}, ...]}.
+
+    Titles are joined in from the `playlists` table once per playlist, and each playlist
+    is represented by a single dict shared by every video that belongs to it. Treat the
+    returned dicts as read-only. Older files that repeat `playlist_title` on every
+    membership row are still accepted; rows matching no known playlist are skipped.
+    """
+    titles = {p["id"]: p["snippet"]["title"] for p in playlists_full.get("playlists", [])}
     lookup = defaultdict(list)
+    refs = {}
     for m in playlists_full["memberships"]:
-        lookup[m["video_id"]].append({
-            "id": m["playlist_id"],
-            "title": m["playlist_title"],
-        })
+        playlist_id = m["playlist_id"]
+        ref = refs.get(playlist_id)
+        if ref is None:
+            title = titles.get(playlist_id, m.get("playlist_title"))
+            if title is None:
+                continue
+            ref = refs[playlist_id] = {"id": playlist_id, "title": title}
+        lookup[m["video_id"]].append(ref)
     return lookup
 
 
@@ -54,6 +90,120 @@ def simplify_video(item, membership_lookup):
     }
 
 
+def export_columns_if_enabled(videos_full, playlists_full):
+    if EXPORT_COLUMNS:
+        export_columns.write_export(videos_full, playlists_full, export_columns.COLUMNS_DIR)
+        print(f"Wrote columnar export → {export_columns.COLUMNS_DIR}")
+
+
+def simplify_and_split(videos_full, membership_lookup):
+    """Simplify raw videos and route each to (public, private) in a single pass."""
+    public = []
+    private = []
+    for item in videos_full:
+        video = simplify_video(item, membership_lookup)
+        if video["privacyStatus"] == "private":
+            private.append(video)
+        else:
+            public.append(video)
+    return public, private
+
+
+def _simplify_chunk(args):
+    return simplify_and_split(*args)
+
+
+def simplify_all(videos_full, membership_lookup, workers=1):
+    """
+    Return (public, private) simplified video lists, preserving input order.
+
+    With more than one worker the raw items are partitioned into contiguous chunks and
+    simplified in a process pool. Each chunk is sent with only the slice of the lookup
+    it needs, and results are concatenated in chunk order so the output is identical to
+    the single-process path.
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(videos_full) < PARALLEL_THRESHOLD:
+        return simplify_and_split(videos_full, membership_lookup)
+
+    chunk_size = -(-len(videos_full) // (workers * 4))
+    chunks = []
+    for i in range(0, len(videos_full), chunk_size):
+        chunk = videos_full[i : i + chunk_size]
+        chunk_lookup = {
+            item["id"]: membership_lookup[item["id"]]
+            for item in chunk
+            if item["id"] in membership_lookup
+        }
+        chunks.append((chunk, chunk_lookup))
+
+    public = []
+    private = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_public, chunk_private in executor.map(_simplify_chunk, chunks):
+            public.extend(chunk_public)
+            private.extend(chunk_private)
+    return public, private
+
+
+def project_list(video):
+    """
+    Return the list-view projection of a simplified video. Projections are marked with
+    `hasDetail`, and projecting one again returns it unchanged.
+
+    Only the thumbnail the gallery card renders (`standard`, else `high`) is kept. A
+    truncated description stays searchable through `searchText`: the distinct lowercase
+    words of the full description, in order of first appearance.
+    """
+    if video.get("hasDetail"):
+        return video
+    thumbnails = video["thumbnails"]
+    projected = {
+        **video,
+        "thumbnails": {"high": None, "standard": thumbnails["standard"] or thumbnails["high"]},
+        "hasDetail": True,
+    }
+    description = video["description"]
+    if len(description) > LIST_DESCRIPTION_LENGTH:
+        projected["description"] = description[:LIST_DESCRIPTION_LENGTH].rstrip() + "…"
+        words = URL_PATTERN.sub(" ", description).lower().split()
+        projected["searchText"] = " ".join(dict.fromkeys(words))
+    return projected
+
+
+def write_details(public):
+    """Write details/<id>.json for each full record and remove files for videos no longer listed."""
+    DETAILS_DIR.mkdir(exist_ok=True)
+    listed = set()
+    written = 0
+    for video in public:
+        listed.add(f"{video['id']}.json")
+        # Records that are already projections (e.g. re-read from a slim videos.json)
+        # had their detail file written by an earlier run.
+        if not video.get("hasDetail"):
+            (DETAILS_DIR / f"{video['id']}.json").write_text(json.dumps(video))
+            written += 1
+    for path in DETAILS_DIR.glob("*.json"):
+        if path.name not in listed:
+            path.unlink()
+    print(f"Wrote {written} video details → {DETAILS_DIR}")
+
+
+def write_outputs(public, private):
+    if PROJECTION == "slim":
+        write_details(public)
+        public = [project_list(v) for v in public]
+    elif PROJECTION != "full":
+        raise ValueError(f"Unknown OUTPUT_PROJECTION {PROJECTION!r}; expected 'full' or 'slim'.")
+
+    OUTPUT_FILE.write_text(json.dumps(public, indent=2))
+    print(f"Wrote {len(public)} videos → {OUTPUT_FILE}")
+
+    PRIVATE_FILE.write_text(json.dumps(private, indent=2))
+    print(f"Wrote {len(private)} private videos → {PRIVATE_FILE}")
+
+
 def main():
     if not VIDEOS_FULL_FILE.exists():
         raise FileNotFoundError(
@@ -68,18 +218,13 @@ def main():
 
     videos_full = json.loads(VIDEOS_FULL_FILE.read_text())
     playlists_full = json.loads(PLAYLISTS_FULL_FILE.read_text())
-
     membership_lookup = build_membership_lookup(playlists_full)
-    simplified = [simplify_video(item, membership_lookup) for item in videos_full]
-
-    public = [v for v in simplified if v["privacyStatus"] != "private"]
-    private = [v for v in simplified if v["privacyStatus"] == "private"]
+    export_columns_if_enabled(videos_full, playlists_full)
+    # The raw membership rows aren't needed past this point, so don't keep them alive.
+    del playlists_full
+    public, private = simplify_all(videos_full, membership_lookup, WORKERS)
 
-    OUTPUT_FILE.write_text(json.dumps(public, indent=2))
-    print(f"Wrote {len(public)} videos → {OUTPUT_FILE}")
-
-    PRIVATE_FILE.write_text(json.dumps(private, indent=2))
-    print(f"Wrote {len(private)} private videos → {PRIVATE_FILE}")
+    write_outputs(public, private)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+"""
+Incrementally brings videos_full.json up to date with the channel's uploads playlist,
+without re-downloading details for every video.
+
+The uploads playlist is paged with its `status` part, giving each video's current
+privacy, and compared with the stored catalog using set operations:
+  - IDs only in the uploads list are new and have their details fetched.
+  - IDs only in the catalog are ambiguous (deleted, or no longer visible); they are
+    re-requested, and any the API no longer returns get a "deleted" tombstone.
+  - IDs in both whose privacy differs from the stored record are re-requested too.
+    The owner's uploads playlist keeps listing videos made private, so this is how
+    they are noticed.
+  - Re-requested videos that came back private get a "private" tombstone and are kept.
+Tombstones accumulate in tombstones.json. Run make_simple_video_list.py afterwards.
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fetch_videos import (
+    build_client,
+    get_credentials,
+    get_uploads_playlist_id,
+    get_video_details,
+    iter_playlist_items,
+    write_atomic,
+)
+
+HERE = Path(__file__).parent
+VIDEOS_FULL_FILE = HERE / "videos_full.json"
+TOMBSTONES_FILE = HERE / "tombstones.json"
+
+
+def diff_ids(stored_ids, current_ids):
+    """Return (new_ids, missing_ids): IDs only in `current_ids` / only in `stored_ids`, in input order."""
+    stored = set(stored_ids)
+    current = set(current_ids)
+    new_ids = [vid for vid in current_ids if vid not in stored]
+    missing_ids = [vid for vid in stored_ids if vid not in current]
+    return new_ids, missing_ids
+
+
+def get_uploads_privacy(youtube, playlist_id):
+    """Return {video_id: privacyStatus} for every item in a playlist, in playlist order."""
+    return {
+        item["contentDetails"]["videoId"]: item["status"]["privacyStatus"]
+        for item in iter_playlist_items(youtube, playlist_id, "contentDetails,status")
+    }
+
+
+def reconcile_catalog(youtube, stored_videos, current_privacy, now=None):
+    """
+    Return (videos, tombstones) for the uploads playlist as described by
+    `current_privacy` ({video_id: privacyStatus}, newest first; see get_uploads_privacy).
+    `videos` is the reconciled raw catalog in that order, followed by any re-requested
+    videos still returned by the API but absent from the uploads list.
+    """
+    now = now or datetime.now(timezone.utc).isoformat(timespec="seconds")
+    stored_by_id = {item["id"]: item for item in stored_videos}
+    current_ids = list(current_privacy)
+    new_ids, missing_ids = diff_ids(list(stored_by_id), current_ids)
+    changed_ids = [
+        vid for vid in current_ids
+        if vid in stored_by_id
+        and stored_by_id[vid]["status"]["privacyStatus"] != current_privacy[vid]
+    ]
+
+    fetched = {
+        item["id"]: item
+        for item in get_video_details(youtube, new_ids + changed_ids + missing_ids)
+    }
+
+    tombstones = []
+    still_present = []
+    for vid in changed_ids + missing_ids:
+        item = fetched.get(vid)
+        if item is None:
+            if vid in current_privacy:
+                # Still listed in uploads; keep the stored record rather than guess.
+                continue
+            tombstones.append({"id": vid, "reason": "deleted", "detectedAt": now})
+            continue
+        was_private = stored_by_id[vid]["status"]["privacyStatus"] == "private"
+        if item["status"]["privacyStatus"] == "private" and not was_private:
+            tombstones.append({"id": vid, "reason": "private", "detectedAt": now})
+        if vid not in current_privacy:
+            still_present.append(item)
+
+    videos = []
+    for vid in current_ids:
+        item = fetched.get(vid) or stored_by_id.get(vid)
+        if item is not None:
+            videos.append(item)
+    return videos + still_present, tombstones
+
+
+def main():
+    if not VIDEOS_FULL_FILE.exists():
+        raise FileNotFoundError(
+            f"Stored catalog not found: {VIDEOS_FULL_FILE}\n"
+            "Run `uv run fetch_videos.py` once for a full sync first."
+        )
+    stored_videos = json.loads(VIDEOS_FULL_FILE.read_text())
+
+    creds = get_credentials()
+    youtube = build_client(creds)
+
+    print("Fetching channel info...")
+    uploads_playlist_id = get_uploads_playlist_id(youtube)
+
+    print("Fetching video IDs and privacy...")
+    current_privacy = get_uploads_privacy(youtube, uploads_playlist_id)
+    print(f"Found {len(current_privacy)} videos; {len(stored_videos)} in the stored catalog. Reconciling...")
+
+    videos, tombstones = reconcile_catalog(youtube, stored_videos, current_privacy)
+    write_atomic(VIDEOS_FULL_FILE, json.dumps(videos, indent=2))
+    print(f"Wrote {len(videos)} videos to {VIDEOS_FULL_FILE}")
+
+    if tombstones:
+        history = json.loads(TOMBSTONES_FILE.read_text()) if TOMBSTONES_FILE.exists() else []
+        history.extend(tombstones)
+        TOMBSTONES_FILE.write_text(json.dumps(history, indent=2))
+        print(f"Recorded {len(tombstones)} tombstones in {TOMBSTONES_FILE}")
+
+
+if __name__ == "__main__":
+    main()
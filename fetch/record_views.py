@@ -0,0 +1,203 @@
+"""
+Appends each run's view counts to an SQLite history and writes trending.json rankings.
+
+Only videos whose count changed since their last sample get a new row, so a run costs
+O(changed videos) and never rewrites past rows; the count at any time is the latest
+sample at or before it. Samples older than FULL_RESOLUTION_DAYS are thinned to one per
+video per week. Reads videos_full.json; run after fetch_videos.py or sync.py.
+
+With --rank-only, trending.json is recomputed from the stored history without recording
+new samples, for runs such as refresh_recent.py that don't fetch every video's statistics.
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+HERE = Path(__file__).parent
+VIDEOS_FULL_FILE = HERE / "videos_full.json"
+VIDEOS_FILE = HERE / "videos.json"
+HISTORY_DB = HERE / "view_history.sqlite3"
+TRENDING_FILE = HERE / "trending.json"
+
+DAY = 24 * 60 * 60
+WEEK = 7 * DAY
+FULL_RESOLUTION_DAYS = 90
+TRENDING_WINDOW_DAYS = 7
+TRENDING_LIMIT = 50
+# Ignore tiny baselines in the growth ranking, where 1 → 5 views would top the list.
+MIN_GROWTH_BASELINE = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS view_counts (
+    video_id TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    view_count INTEGER NOT NULL,
+    PRIMARY KEY (video_id, ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS latest (
+    video_id TEXT PRIMARY KEY,
+    ts INTEGER NOT NULL,
+    view_count INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def connect(path=None):
+    conn = sqlite3.connect(path or HISTORY_DB)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def record(conn, counts, ts):
+    """Append (video_id, ts, count) for each video whose count changed; return how many."""
+    latest = dict(conn.execute("SELECT video_id, view_count FROM latest"))
+    changed = [(vid, ts, count) for vid, count in counts.items() if latest.get(vid) != count]
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO view_counts VALUES (?, ?, ?)", changed)
+        conn.executemany(
+            "INSERT INTO latest VALUES (?, ?, ?) ON CONFLICT (video_id) "
+            "DO UPDATE SET ts = excluded.ts, view_count = excluded.view_count",
+            changed,
+        )
+    return len(changed)
+
+
+def downsample(conn, now):
+    """Keep only the last sample per video per week for samples older than the full-resolution window."""
+    cutoff = now - FULL_RESOLUTION_DAYS * DAY
+    with conn:
+        cursor = conn.execute(
+            """
+            DELETE FROM view_counts WHERE (video_id, ts) IN (
+                SELECT video_id, ts FROM (
+                    SELECT video_id, ts, ROW_NUMBER() OVER (
+                        PARTITION BY video_id, ts / ? ORDER BY ts DESC
+                    ) AS rank
+                    FROM view_counts WHERE ts < ?
+                ) WHERE rank > 1
+            )
+            """,
+            (WEEK, cutoff),
+        )
+    return cursor.rowcount
+
+
+def rankings(conn, now, eligible_ids, window_days=TRENDING_WINDOW_DAYS, limit=TRENDING_LIMIT):
+    """
+    Return {"trending": [...], "fastestGrowing": [...]} over the last `window_days`.
+
+    A video's baseline is its count at the start of the window, or its first sample if
+    it was first seen inside the window. "trending" ranks by views gained,
+    "fastestGrowing" by gain relative to the baseline.
+    """
+    start = now - window_days * DAY
+    rows = conn.execute(
+        """
+        SELECT l.video_id, l.view_count,
+            (SELECT view_count FROM view_counts v
+             WHERE v.video_id = l.video_id AND v.ts <= ? ORDER BY v.ts DESC LIMIT 1),
+            (SELECT view_count FROM view_counts v
+             WHERE v.video_id = l.video_id ORDER BY v.ts LIMIT 1)
+        FROM latest l
+        """,
+        (start,),
+    )
+    entries = []
+    for video_id, view_count, at_start, first in rows:
+        if video_id not in eligible_ids:
+            continue
+        baseline = at_start if at_start is not None else first
+        gain = view_count - baseline
+        if gain > 0:
+            entries.append({
+                "id": video_id,
+                "viewCount": view_count,
+                "gain": gain,
+                "growth": round(gain / max(baseline, 1), 4),
+                "baseline": baseline,
+            })
+
+    trending = sorted(entries, key=lambda e: (-e["gain"], e["id"]))[:limit]
+    growing = sorted(
+        (e for e in entries if e["baseline"] >= MIN_GROWTH_BASELINE),
+        key=lambda e: (-e["growth"], e["id"]),
+    )[:limit]
+    return {"trending": trending, "fastestGrowing": growing}
+
+
+def record_and_rank(now):
+    if not VIDEOS_FULL_FILE.exists():
+        raise FileNotFoundError(
+            f"Input file not found: {VIDEOS_FULL_FILE}\n"
+            "Run `uv run fetch_videos.py` first."
+        )
+    videos_full = json.loads(VIDEOS_FULL_FILE.read_text())
+    counts = {
+        item["id"]: int(item.get("statistics", {}).get("viewCount", 0)) for item in videos_full
+    }
+    # Private videos are recorded but never ranked, since trending.json is published.
+    eligible_ids = {
+        item["id"] for item in videos_full if item["status"]["privacyStatus"] != "private"
+    }
+
+    conn = connect()
+    try:
+        changed = record(conn, counts, now)
+        removed = downsample(conn, now)
+        ranked = rankings(conn, now, eligible_ids)
+    finally:
+        conn.close()
+    print(f"Recorded {changed} changed view counts ({removed} old samples thinned) → {HISTORY_DB}")
+    return ranked
+
+
+def rank_only(now):
+    if not VIDEOS_FILE.exists():
+        raise FileNotFoundError(
+            f"Input file not found: {VIDEOS_FILE}\n"
+            "Run `uv run make_simple_video_list.py` first."
+        )
+    # videos.json lists exactly the public and unlisted videos, including any new
+    # uploads the run added; those have no history yet and simply don't rank.
+    eligible_ids = {video["id"] for video in json.loads(VIDEOS_FILE.read_text())}
+
+    conn = connect()
+    try:
+        return rankings(conn, now, eligible_ids)
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--rank-only",
+        action="store_true",
+        help="rank from the stored history without recording the current view counts",
+    )
+    args = parser.parse_args(argv)
+    now = int(time.time())
+
+    if args.rank_only:
+        if not HISTORY_DB.exists():
+            print(f"No view history at {HISTORY_DB}; not writing {TRENDING_FILE}.")
+            return
+        ranked = rank_only(now)
+    else:
+        ranked = record_and_rank(now)
+
+    TRENDING_FILE.write_text(json.dumps({
+        "generatedAt": datetime.fromtimestamp(now, timezone.utc).isoformat(timespec="seconds"),
+        "windowDays": TRENDING_WINDOW_DAYS,
+        **ranked,
+    }, indent=2))
+    print(f"Wrote {len(ranked['trending'])} trending videos → {TRENDING_FILE}")
+
+
+if __name__ == "__main__":
+    main()
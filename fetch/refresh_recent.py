@@ -0,0 +1,73 @@
+"""
+Fast refresh that only adds uploads newer than the existing outputs.
+
+Pages the uploads playlist (newest first) until it reaches a video that is already in
+videos.json or videos_private.json, fetches details for just the new videos, and
+prepends them to the simplified outputs (and to videos_full.json, if present).
+
+Existing records are left untouched, so view counts, edits and deletions are only
+picked up by a full sync (sync.py) or by reconcile.py. New videos get playlist
+memberships from the stored playlists_full.json, if there is one.
+"""
+
+import json
+from pathlib import Path
+
+import make_simple_video_list
+from fetch_videos import (
+    build_client,
+    get_all_video_ids,
+    get_credentials,
+    get_uploads_playlist_id,
+    get_video_details,
+    write_atomic,
+)
+from make_simple_video_list import build_membership_lookup, simplify_all
+
+HERE = Path(__file__).parent
+VIDEOS_FULL_FILE = HERE / "videos_full.json"
+PLAYLISTS_FULL_FILE = HERE / "playlists_full.json"
+
+
+def read_json(path, default):
+    return json.loads(path.read_text()) if path.exists() else default
+
+
+def main():
+    output_file = make_simple_video_list.OUTPUT_FILE
+    if not output_file.exists():
+        raise FileNotFoundError(
+            f"Existing output not found: {output_file}\n"
+            "Run `uv run sync.py` once for a full sync first."
+        )
+    public = json.loads(output_file.read_text())
+    private = read_json(make_simple_video_list.PRIVATE_FILE, [])
+    known_ids = {v["id"] for v in public} | {v["id"] for v in private}
+
+    creds = get_credentials()
+    youtube = build_client(creds)
+
+    print("Fetching channel info...")
+    uploads_playlist_id = get_uploads_playlist_id(youtube)
+
+    print(f"Looking for uploads newer than the {len(known_ids)} known videos...")
+    new_ids = get_all_video_ids(youtube, uploads_playlist_id, stop_at=known_ids)
+    if not new_ids:
+        print("No new videos.")
+        return
+    print(f"Found {len(new_ids)} new videos. Fetching metadata...")
+
+    new_videos = get_video_details(youtube, new_ids)
+    membership_lookup = build_membership_lookup(read_json(PLAYLISTS_FULL_FILE, {"memberships": []}))
+    new_public, new_private = simplify_all(new_videos, membership_lookup)
+
+    if VIDEOS_FULL_FILE.exists():
+        videos_full = json.loads(VIDEOS_FULL_FILE.read_text())
+        write_atomic(VIDEOS_FULL_FILE, json.dumps(new_videos + videos_full, indent=2))
+        print(f"Added {len(new_videos)} videos to {VIDEOS_FULL_FILE}")
+
+    make_simple_video_list.write_outputs(new_public + public, new_private + private)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Packs the pipeline's working state into one compressed file, and restores it.
+
+The bundle lets CI runs start warm: the raw catalog (including each item's ETag), the
+simplified outputs, tombstones and the view history are saved at the end of one run and
+restored at the start of the next. Per-video details/ are not included; they ship in
+the videos-json artifact, which the workflow already downloads.
+
+Format: a gzip-compressed tar whose first member is bundle.json, listing every file
+with its size and SHA-256, followed by the files themselves under state/. Restoring
+checks the format version and every checksum before anything is written, so a
+truncated or corrupt bundle leaves the working directory untouched.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+
+HERE = Path(__file__).parent
+BUNDLE_FILE = HERE / "fetch_state.tar.gz"
+
+BUNDLE_FORMAT = 1
+MANIFEST_NAME = "bundle.json"
+STATE_PREFIX = "state/"
+# Files (relative to fetch/) carried between runs; missing ones are skipped.
+STATE_PATHS = [
+    "videos_full.json",
+    "playlists_full.json",
+    "videos.json",
+    "videos_private.json",
+    "tombstones.json",
+    "view_history.sqlite3",
+]
+
+
+class BundleError(ValueError):
+    """Raised when a state bundle is unreadable, of an unknown format, or fails its checksums."""
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def collect_files(root, paths=STATE_PATHS):
+    """Return the names in `paths` that exist as regular files in `root`."""
+    return [name for name in paths if (root / name).is_file()]
+
+
+def save_bundle(output=BUNDLE_FILE, root=HERE, paths=STATE_PATHS):
+    """Write the state under `root` to `output` atomically and return the bundle manifest."""
+    names = collect_files(root, paths)
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "createdAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "files": {
+            name: {"size": (root / name).stat().st_size, "sha256": sha256_file(root / name)}
+            for name in names
+        },
+    }
+    encoded = json.dumps(manifest, indent=2).encode()
+
+    fd, tmp = tempfile.mkstemp(dir=output.parent, prefix=f".{output.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f, tarfile.open(fileobj=f, mode="w:gz") as tar:
+            info = tarfile.TarInfo(MANIFEST_NAME)
+            info.size = len(encoded)
+            info.mtime = int(datetime.now(timezone.utc).timestamp())
+            tar.addfile(info, io.BytesIO(encoded))
+            for name in names:
+                tar.add(root / name, arcname=STATE_PREFIX + name, recursive=False)
+        os.replace(tmp, output)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return manifest
+
+
+def _safe_name(name):
+    path = PurePosixPath(name)
+    return bool(name) and not path.is_absolute() and ".." not in path.parts
+
+
+def restore_bundle(bundle=BUNDLE_FILE, root=HERE):
+    """
+    Verify `bundle` and restore its files into `root`; return the bundle manifest.
+
+    Every file is extracted to a staging directory and checked against the manifest
+    first. Raises BundleError, without touching `root`, if anything does not match.
+    """
+    staging = Path(tempfile.mkdtemp(dir=root, prefix=".state-restore-"))
+    try:
+        try:
+            with tarfile.open(bundle, mode="r:gz") as tar:
+                first = tar.next()
+                if first is None or first.name != MANIFEST_NAME:
+                    raise BundleError(f"{bundle} does not start with {MANIFEST_NAME}")
+                manifest = json.loads(tar.extractfile(first).read())
+                if manifest.get("format") != BUNDLE_FORMAT:
+                    raise BundleError(
+                        f"Unsupported state bundle format {manifest.get('format')} in {bundle}"
+                    )
+                expected = manifest["files"]
+                if not all(_safe_name(name) for name in expected):
+                    raise BundleError(f"{bundle} lists a file outside the state directory")
+
+                seen = set()
+                while (member := tar.next()) is not None:
+                    name = member.name.removeprefix(STATE_PREFIX)
+                    if not member.isfile() or name not in expected or name in seen:
+                        raise BundleError(f"Unexpected member {member.name!r} in {bundle}")
+                    digest = hashlib.sha256()
+                    target = staging / name
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    with tar.extractfile(member) as src, open(target, "wb") as dst:
+                        for chunk in iter(lambda: src.read(1 << 20), b""):
+                            digest.update(chunk)
+                            dst.write(chunk)
+                    if digest.hexdigest() != expected[name]["sha256"]:
+                        raise BundleError(f"Checksum mismatch for {name} in {bundle}")
+                    seen.add(name)
+        except (tarfile.TarError, EOFError, OSError, json.JSONDecodeError, KeyError) as e:
+            raise BundleError(f"Could not read state bundle {bundle}: {e}") from e
+
+        missing = set(expected) - seen
+        if missing:
+            raise BundleError(f"{bundle} is missing {len(missing)} files, e.g. {min(missing)}")
+
+        for name in expected:
+            target = root / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staging / name, target)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("command", choices=["save", "restore"])
+    parser.add_argument("--bundle", type=Path, default=BUNDLE_FILE)
+    args = parser.parse_args(argv)
+
+    if args.command == "save":
+        manifest = save_bundle(args.bundle, HERE)
+        size = args.bundle.stat().st_size / (1 << 20)
+        print(f"Saved {len(manifest['files'])} state files ({size:.1f} MiB) → {args.bundle}")
+        return
+
+    if not args.bundle.exists():
+        print(f"No state bundle at {args.bundle}; starting cold.")
+        return
+    manifest = restore_bundle(args.bundle, HERE)
+    print(
+        f"Restored {len(manifest['files'])} state files from {args.bundle} "
+        f"(saved {manifest['createdAt']})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Fetches videos and playlists and writes both the raw and the simplified outputs in one pass.
+
+Equivalent to running fetch_videos.py followed by make_simple_video_list.py, except that
+each batch of video details is simplified as soon as it arrives instead of being written
+to disk and re-parsed, and playlist memberships are fetched on a second thread while the
+video batches are streaming in.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import fetch_videos
+import make_simple_video_list
+from fetch_videos import (
+    build_client,
+    get_all_playlists,
+    get_all_video_ids,
+    get_credentials,
+    get_playlist_memberships,
+    get_uploads_playlist_id,
+    iter_video_details,
+)
+from make_simple_video_list import (
+    build_membership_lookup,
+    export_columns_if_enabled,
+    simplify_and_split,
+)
+
+
+def fetch_playlists_full(creds):
+    """Fetch playlists and memberships using a dedicated client (httplib2 is not thread-safe)."""
+    youtube = build_client(creds)
+    playlists = get_all_playlists(youtube)
+    memberships = get_playlist_memberships(youtube, playlists)
+    return {"playlists": playlists, "memberships": memberships}
+
+
+def main():
+    creds = get_credentials()
+    youtube = build_client(creds)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        print("Fetching playlists in the background...")
+        playlists_future = executor.submit(fetch_playlists_full, creds)
+
+        print("Fetching channel info...")
+        uploads_playlist_id = get_uploads_playlist_id(youtube)
+
+        print("Fetching video IDs...")
+        video_ids = get_all_video_ids(youtube, uploads_playlist_id)
+        print(f"Found {len(video_ids)} videos. Fetching and simplifying metadata...")
+
+        videos = []
+        public = []
+        private = []
+        for items in iter_video_details(youtube, video_ids):
+            videos.extend(items)
+            # Playlists are attached below, once the membership fetch has finished.
+            batch_public, batch_private = simplify_and_split(items, {})
+            public.extend(batch_public)
+            private.extend(batch_private)
+
+        fetch_videos.OUTPUT_FILE.write_text(json.dumps(videos, indent=2))
+        print(f"Wrote {len(videos)} videos to {fetch_videos.OUTPUT_FILE}")
+
+        playlists_full = playlists_future.result()
+
+    fetch_videos.PLAYLISTS_FILE.write_text(json.dumps(playlists_full, indent=2))
+    print(
+        f"Wrote {len(playlists_full['playlists'])} playlists and "
+        f"{len(playlists_full['memberships'])} memberships to {fetch_videos.PLAYLISTS_FILE}"
+    )
+
+    export_columns_if_enabled(videos, playlists_full)
+    membership_lookup = build_membership_lookup(playlists_full)
+    for video in public + private:
+        video["playlists"] = membership_lookup.get(video["id"], [])
+
+    make_simple_video_list.write_outputs(public, private)
+
+
+if __name__ == "__main__":
+    main()
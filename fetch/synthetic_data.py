@@ -0,0 +1,217 @@
+"""
+Synthetic YouTube channel data for benchmarks and offline testing.
+
+make_channel() generates raw API objects shaped like the real responses (the same
+`part` values fetch_videos.py requests), and FakeYouTube serves them through the same
+call chain as the googleapiclient client, e.g. `youtube.videos().list(...).execute()`,
+with optional per-request latency.
+"""
+
+import random
+import time
+
+PAGE_SIZE = 50
+UPLOADS_PLAYLIST_ID = "UUsynthetic"
+CHANNEL_ID = "UCsynthetic"
+
+
+def make_video(index, rng):
+    video_id = f"v{index:010d}"
+    privacy_status = rng.choices(["public", "unlisted", "private"], weights=[6, 3, 1])[0]
+    thumbnails = {
+        "default": {"url": f"https://i.ytimg.com/vi/{video_id}/default.jpg", "width": 120, "height": 90},
+        "medium": {"url": f"https://i.ytimg.com/vi/{video_id}/mqdefault.jpg", "width": 320, "height": 180},
+        "high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg", "width": 480, "height": 360},
+    }
+    if rng.random() < 0.8:
+        thumbnails["standard"] = {
+            "url": f"https://i.ytimg.com/vi/{video_id}/sddefault.jpg", "width": 640, "height": 480,
+        }
+    published_at = f"20{10 + index % 15:02d}-{1 + index % 12:02d}-{1 + index % 28:02d}T12:00:00Z"
+    title = f"Synthetic video {index}"
+    description = f"Description for video {index}. " * rng.randint(0, 20)
+    snippet = {
+        "publishedAt": published_at,
+        "channelId": CHANNEL_ID,
+        "title": title,
+        "description": description,
+        "thumbnails": thumbnails,
+        "channelTitle": "Synthetic Channel",
+        "categoryId": "22",
+        "liveBroadcastContent": "none",
+        "localized": {"title": title, "description": description},
+    }
+    if rng.random() < 0.7:
+        snippet["tags"] = [f"tag{rng.randint(0, 200)}" for _ in range(rng.randint(1, 8))]
+    return {
+        "kind": "youtube#video",
+        "etag": f"etag-{video_id}",
+        "id": video_id,
+        "snippet": snippet,
+        "contentDetails": {
+            "duration": f"PT{rng.randint(0, 59)}M{rng.randint(0, 59)}S",
+            "dimension": "2d",
+            "definition": "hd",
+            "caption": "false",
+            "licensedContent": False,
+            "projection": "rectangular",
+        },
+        "statistics": {
+            "viewCount": str(rng.randint(0, 100_000)),
+            "likeCount": str(rng.randint(0, 1_000)),
+            "favoriteCount": "0",
+            "commentCount": str(rng.randint(0, 100)),
+        },
+        "status": {
+            "uploadStatus": "processed",
+            "privacyStatus": privacy_status,
+            "license": "youtube",
+            "embeddable": True,
+            "publicStatsViewable": True,
+            "madeForKids": False,
+        },
+    }
+
+
+def make_playlist(index):
+    playlist_id = f"PL{index:08d}"
+    return {
+        "kind": "youtube#playlist",
+        "etag": f"etag-{playlist_id}",
+        "id": playlist_id,
+        "snippet": {
+            "publishedAt": "2020-01-01T00:00:00Z",
+            "channelId": CHANNEL_ID,
+            "title": f"Synthetic playlist {index}",
+            "description": "",
+            "channelTitle": "Synthetic Channel",
+        },
+    }
+
+
+def make_channel(num_videos, num_playlists, memberships_per_video=2, seed=0):
+    """
+    Return a dict describing a synthetic channel:
+      {"videos": [...], "playlists": [...], "playlist_items": {playlist_id: [video_id, ...]}}
+
+    Videos are ordered newest first, like the uploads playlist. Each video is placed in
+    up to `memberships_per_video` randomly chosen playlists.
+    """
+    rng = random.Random(seed)
+    videos = [make_video(i, rng) for i in range(num_videos)]
+    playlists = [make_playlist(i) for i in range(num_playlists)]
+    playlist_items = {p["id"]: [] for p in playlists}
+    if playlists:
+        for video in videos:
+            for playlist in rng.sample(playlists, min(memberships_per_video, len(playlists))):
+                playlist_items[playlist["id"]].append(video["id"])
+    return {"videos": videos, "playlists": playlists, "playlist_items": playlist_items}
+
+
+def page(items, page_token, max_results=PAGE_SIZE):
+    """Slice one page out of `items`; page tokens are stringified offsets."""
+    start = int(page_token) if page_token else 0
+    end = start + max_results
+    response = {"items": items[start:end], "pageInfo": {"totalResults": len(items)}}
+    if end < len(items):
+        response["nextPageToken"] = str(end)
+    return response
+
+
+def playlist_item(playlist_id, video_id, position, part="snippet,contentDetails", privacy="public"):
+    """Return a playlistItem resource with only the requested parts, like the real API."""
+    item = {"kind": "youtube#playlistItem", "id": f"{playlist_id}.{position}"}
+    parts = part.split(",")
+    if "snippet" in parts:
+        item["snippet"] = {
+            "playlistId": playlist_id,
+            "position": position,
+            "title": f"Title of {video_id}",
+            "resourceId": {"kind": "youtube#video", "videoId": video_id},
+        }
+    if "contentDetails" in parts:
+        item["contentDetails"] = {"videoId": video_id}
+    if "status" in parts:
+        item["status"] = {"privacyStatus": privacy}
+    return item
+
+
+class FakeYouTube:
+    """In-process stand-in for the googleapiclient YouTube client, backed by make_channel() data."""
+
+    def __init__(self, channel, latency=0.0):
+        self.channel = channel
+        self.latency = latency
+        self.request_count = 0
+        self._videos_by_id = {v["id"]: v for v in channel["videos"]}
+        self._uploads = [v["id"] for v in channel["videos"]]
+
+    def _respond(self, response):
+        self.request_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return response
+
+    def list_channels(self, **params):
+        return {
+            "items": [{
+                "id": CHANNEL_ID,
+                "contentDetails": {"relatedPlaylists": {"uploads": UPLOADS_PLAYLIST_ID}},
+            }]
+        }
+
+    def list_playlists(self, pageToken=None, maxResults=PAGE_SIZE, **params):
+        return page(self.channel["playlists"], pageToken, maxResults)
+
+    def list_playlist_items(
+        self, playlistId, part="snippet,contentDetails", pageToken=None, maxResults=PAGE_SIZE, **params
+    ):
+        if playlistId == UPLOADS_PLAYLIST_ID:
+            video_ids = self._uploads
+        else:
+            video_ids = self.channel["playlist_items"].get(playlistId, [])
+        response = page(video_ids, pageToken, maxResults)
+        start = int(pageToken) if pageToken else 0
+        response["items"] = [
+            playlist_item(playlistId, vid, start + i, part, self._privacy(vid))
+            for i, vid in enumerate(response["items"])
+        ]
+        return response
+
+    def _privacy(self, video_id):
+        video = self._videos_by_id.get(video_id)
+        return video["status"]["privacyStatus"] if video else "private"
+
+    def list_videos(self, id, **params):
+        ids = id.split(",")
+        return {"items": [self._videos_by_id[vid] for vid in ids if vid in self._videos_by_id]}
+
+    def channels(self):
+        return _Resource(self, self.list_channels)
+
+    def playlists(self):
+        return _Resource(self, self.list_playlists)
+
+    def playlistItems(self):
+        return _Resource(self, self.list_playlist_items)
+
+    def videos(self):
+        return _Resource(self, self.list_videos)
+
+
+class _Resource:
+    def __init__(self, client, handler):
+        self._client = client
+        self._handler = handler
+
+    def list(self, **params):
+        return _Request(self._client, lambda: self._handler(**params))
+
+
+class _Request:
+    def __init__(self, client, handler):
+        self._client = client
+        self._handler = handler
+
+    def execute(self):
+        return self._client._respond(self._handler())
@@ -0,0 +1,120 @@
+"""
+Unit tests for export_columns.py.
+
+Run with: python3 -m pytest fetch/tests/ (from repo root)
+         or: python3 -m pytest (from fetch/ directory)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import export_columns  # noqa: E402
+from export_columns import load_table, parse_duration, parse_timestamp, write_export  # noqa: E402
+from tests.test_make_simple_video_list import make_raw_video  # noqa: E402
+
+
+PLAYLISTS_FULL = {
+    "playlists": [
+        {"id": "PL1", "snippet": {"title": "One"}},
+        {"id": "PL2", "snippet": {"title": "Two"}},
+    ],
+    "memberships": [
+        {"video_id": "v2", "playlist_id": "PL1"},
+        {"video_id": "v1", "playlist_id": "PL2"},
+        {"video_id": "elsewhere", "playlist_id": "PL2"},
+    ],
+}
+
+
+class TestParsers:
+    @pytest.mark.parametrize("value, seconds", [
+        ("PT1H2M3S", 3723),
+        ("PT45S", 45),
+        ("PT10M", 600),
+        ("P1DT1S", 86401),
+        ("P0D", 0),
+        (None, 0),
+        ("garbage", 0),
+    ])
+    def test_parse_duration(self, value, seconds):
+        assert parse_duration(value) == seconds
+
+    def test_parse_timestamp(self):
+        assert parse_timestamp("1970-01-02T00:00:00Z") == 86400
+
+
+class TestRoundTrip:
+    def test_videos_table(self, tmp_path):
+        videos = [
+            make_raw_video(video_id="v1", view_count="5", like_count="2", duration="PT1M5S"),
+            make_raw_video(
+                video_id="v2", title="Títle v2", view_count="12345678901",
+                privacy_status="private", duration="PT1M5S",
+            ),
+        ]
+        write_export(videos, PLAYLISTS_FULL, tmp_path)
+
+        table = load_table("videos", tmp_path)
+
+        assert list(table["id"]) == ["v1", "v2"]
+        assert table["title"][1] == "Títle v2"
+        assert table["viewCount"].tolist() == [5, 12345678901]
+        assert table["likeCount"].tolist() == [2, 0]
+        assert table["durationSeconds"].tolist() == [65, 65]
+        assert table["publishedAt"][0] == parse_timestamp("2024-01-15T10:00:00Z")
+        schema = json.loads((tmp_path / "schema.json").read_text())
+        categories = schema["tables"]["videos"]["columns"]["privacyStatus"]["categories"]
+        assert [categories[c] for c in table["privacyStatus"]] == ["public", "private"]
+
+    def test_memberships_reference_rows(self, tmp_path):
+        write_export(
+            [make_raw_video(video_id="v1"), make_raw_video(video_id="v2")], PLAYLISTS_FULL, tmp_path
+        )
+
+        memberships = load_table("memberships", tmp_path)
+        playlists = load_table("playlists", tmp_path)
+
+        assert memberships["videoRow"].tolist() == [1, 0]
+        assert [playlists["title"][r] for r in memberships["playlistRow"]] == ["One", "Two"]
+
+    def test_empty_catalog(self, tmp_path):
+        schema = write_export([], {"playlists": [], "memberships": []}, tmp_path)
+
+        assert schema["tables"]["videos"]["rows"] == 0
+        table = load_table("videos", tmp_path)
+        assert len(table["id"]) == 0
+        assert len(table["viewCount"]) == 0
+
+    def test_rejects_unknown_format(self, tmp_path):
+        write_export([], {"playlists": [], "memberships": []}, tmp_path)
+        schema = json.loads((tmp_path / "schema.json").read_text())
+        schema["format"] = 99
+        (tmp_path / "schema.json").write_text(json.dumps(schema))
+
+        with pytest.raises(ValueError, match="format"):
+            load_table("videos", tmp_path)
+
+
+class TestMain:
+    def test_writes_export_from_raw_files(self, tmp_path, monkeypatch):
+        videos_full = tmp_path / "videos_full.json"
+        playlists_full = tmp_path / "playlists_full.json"
+        videos_full.write_text(json.dumps([make_raw_video(video_id="v1")]))
+        playlists_full.write_text(json.dumps(PLAYLISTS_FULL))
+        monkeypatch.setattr(export_columns, "VIDEOS_FULL_FILE", videos_full)
+        monkeypatch.setattr(export_columns, "PLAYLISTS_FULL_FILE", playlists_full)
+        monkeypatch.setattr(export_columns, "COLUMNS_DIR", tmp_path / "columns")
+
+        export_columns.main()
+
+        assert list(load_table("videos", tmp_path / "columns")["id"]) == ["v1"]
+
+    def test_raises_if_inputs_missing(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(export_columns, "VIDEOS_FULL_FILE", tmp_path / "videos_full.json")
+        with pytest.raises(FileNotFoundError, match="videos_full.json"):
+            export_columns.main()
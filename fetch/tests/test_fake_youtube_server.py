@@ -0,0 +1,106 @@
+"""
+Unit tests for fake_youtube_server.py.
+
+The server is started on an ephemeral local port and exercised over real HTTP
+with urllib. Run with: python3 -m pytest fetch/tests/ (from repo root)
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_youtube_server import FakeYouTubeServer  # noqa: E402
+from synthetic_data import UPLOADS_PLAYLIST_ID, make_channel  # noqa: E402
+
+
+@pytest.fixture
+def start_server():
+    servers = []
+
+    def start(**kwargs):
+        server = FakeYouTubeServer(("127.0.0.1", 0), make_channel(120, 5), **kwargs)
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def get(server, path, headers=None):
+    with urlopen(Request(server.api_url + path, headers=headers or {})) as response:
+        return response.status, response.headers, json.loads(response.read() or b"null")
+
+
+class TestEndpoints:
+    def test_channels_returns_uploads_playlist(self, start_server):
+        server = start_server()
+        _, _, body = get(server, "channels?part=contentDetails&mine=true")
+        assert body["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"] == UPLOADS_PLAYLIST_ID
+
+    def test_playlist_items_paginate(self, start_server):
+        server = start_server()
+        _, _, page1 = get(server, f"playlistItems?playlistId={UPLOADS_PLAYLIST_ID}&maxResults=50")
+        _, _, page3 = get(
+            server, f"playlistItems?playlistId={UPLOADS_PLAYLIST_ID}&maxResults=50&pageToken=100"
+        )
+        assert len(page1["items"]) == 50
+        assert page1["nextPageToken"] == "50"
+        assert len(page3["items"]) == 20
+        assert "nextPageToken" not in page3
+
+    def test_videos_by_id(self, start_server):
+        server = start_server()
+        _, _, body = get(server, "videos?id=v0000000001,v0000000002,missing&part=snippet")
+        assert [v["id"] for v in body["items"]] == ["v0000000001", "v0000000002"]
+
+    def test_unknown_endpoint_is_404(self, start_server):
+        server = start_server()
+        with pytest.raises(HTTPError) as exc_info:
+            get(server, "subscriptions")
+        assert exc_info.value.code == 404
+
+
+class TestETags:
+    def test_if_none_match_returns_304(self, start_server):
+        server = start_server()
+        _, headers, body = get(server, "playlists?mine=true")
+        assert headers["ETag"] == body["etag"]
+
+        with pytest.raises(HTTPError) as exc_info:
+            get(server, "playlists?mine=true", headers={"If-None-Match": headers["ETag"]})
+        assert exc_info.value.code == 304
+
+    def test_stale_etag_returns_200(self, start_server):
+        server = start_server()
+        status, _, _ = get(server, "playlists?mine=true", headers={"If-None-Match": '"stale"'})
+        assert status == 200
+
+
+class TestFaultInjection:
+    def test_quota_exceeded_after_budget(self, start_server):
+        server = start_server(quota=2)
+        get(server, "playlists?mine=true")
+        get(server, "playlists?mine=true")
+        with pytest.raises(HTTPError) as exc_info:
+            get(server, "playlists?mine=true")
+        assert exc_info.value.code == 403
+        error = json.loads(exc_info.value.read())["error"]
+        assert error["errors"][0]["reason"] == "quotaExceeded"
+        assert server.request_count == 3
+        assert server.quota_used == 2
+
+    def test_error_rate_one_always_fails(self, start_server):
+        server = start_server(error_rate=1.0)
+        with pytest.raises(HTTPError) as exc_info:
+            get(server, "videos?id=v0000000001")
+        assert exc_info.value.code == 503
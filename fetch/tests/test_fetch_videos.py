@@ -8,6 +8,9 @@ credentials are required. Run with:
 
 import json
 import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest.mock import MagicMock, patch, call
 
@@ -21,6 +24,7 @@ import pytest
 for _mod in [
     "google",
     "google.auth",
+    "google.auth.credentials",
     "google.auth.transport",
     "google.auth.transport.requests",
     "google.oauth2",
@@ -75,6 +79,8 @@ class TestGetCredentials:
         mock_creds = MagicMock()
         mock_creds.valid = True
         mock_creds.expired = False
+        # The credential manager routes creds.refresh through its lock, so keep the original.
+        original_refresh = mock_creds.refresh
 
         with patch("fetch_videos.Credentials") as MockCreds:
             MockCreds.from_authorized_user_file.return_value = mock_creds
@@ -82,7 +88,7 @@ class TestGetCredentials:
 
         assert result is mock_creds
         # No refresh should have been triggered
-        mock_creds.refresh.assert_not_called()
+        original_refresh.assert_not_called()
 
     def test_refreshes_expired_credentials_and_saves_token(self, tmp_path, monkeypatch):
         token_path = tmp_path / "token.json"
@@ -94,13 +100,14 @@ class TestGetCredentials:
         mock_creds.expired = True
         mock_creds.refresh_token = "some_refresh_token"
         mock_creds.to_json.return_value = '{"token": "refreshed"}'
+        original_refresh = mock_creds.refresh
 
         with patch("fetch_videos.Credentials") as MockCreds, \
              patch("fetch_videos.Request") as MockRequest:
             MockCreds.from_authorized_user_file.return_value = mock_creds
             fetch_videos.get_credentials()
 
-        mock_creds.refresh.assert_called_once()
+        original_refresh.assert_called_once()
         assert token_path.read_text() == '{"token": "refreshed"}'
 
     def test_does_not_refresh_when_no_refresh_token(self, tmp_path, monkeypatch):
@@ -112,12 +119,157 @@ class TestGetCredentials:
         mock_creds.valid = False
         mock_creds.expired = True
         mock_creds.refresh_token = None
+        original_refresh = mock_creds.refresh
 
         with patch("fetch_videos.Credentials") as MockCreds:
             MockCreds.from_authorized_user_file.return_value = mock_creds
             result = fetch_videos.get_credentials()
 
-        mock_creds.refresh.assert_not_called()
+        original_refresh.assert_not_called()
+
+    def test_anonymous_credentials_when_api_url_set(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(fetch_videos, "TOKEN_FILE", tmp_path / "nonexistent_token.json")
+        monkeypatch.setattr(fetch_videos, "API_URL", "http://127.0.0.1:8080/youtube/v3/")
+
+        with patch("fetch_videos.AnonymousCredentials") as MockAnonymous:
+            result = fetch_videos.get_credentials()
+
+        assert result is MockAnonymous.return_value
+
+
+# ---------------------------------------------------------------------------
+# Tests: CredentialManager
+# ---------------------------------------------------------------------------
+
+class FakeCredentials:
+    """Minimal stand-in for google.oauth2.credentials.Credentials with a real expiry."""
+
+    def __init__(self, expires_in, refresh_delay=0.0):
+        self.token = "token-0"
+        self.refresh_token = "refresh"
+        self.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + expires_in
+        self.refresh_count = 0
+        self.refresh_delay = refresh_delay
+
+    @property
+    def expired(self):
+        return self.expiry <= datetime.now(timezone.utc).replace(tzinfo=None)
+
+    @property
+    def valid(self):
+        return not self.expired
+
+    def refresh(self, request):
+        time.sleep(self.refresh_delay)
+        self.refresh_count += 1
+        self.token = f"token-{self.refresh_count}"
+        self.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1)
+
+    def to_json(self):
+        return json.dumps({"token": self.token})
+
+
+class TestCredentialManager:
+    @pytest.fixture
+    def make_manager(self, tmp_path, monkeypatch):
+        """Return a factory for a CredentialManager whose token file loads as `creds`."""
+        token_path = tmp_path / "token.json"
+        token_path.write_text('{"token": "token-0"}')
+        MockCreds = MagicMock()
+        monkeypatch.setattr(fetch_videos, "Credentials", MockCreds)
+
+        def make(creds):
+            MockCreds.from_authorized_user_file.return_value = creds
+            manager = fetch_videos.CredentialManager(token_path, refresh_margin=timedelta(minutes=5))
+            return manager, token_path
+
+        return make
+
+    def test_refreshes_ahead_of_expiry(self, make_manager):
+        creds = FakeCredentials(expires_in=timedelta(minutes=2))
+        manager, token_path = make_manager(creds)
+
+        result = manager.credentials()
+
+        assert result is creds
+        assert creds.refresh_count == 1
+        assert json.loads(token_path.read_text()) == {"token": "token-1"}
+
+    def test_no_refresh_when_far_from_expiry(self, make_manager):
+        creds = FakeCredentials(expires_in=timedelta(minutes=30))
+        manager, _ = make_manager(creds)
+
+        manager.credentials()
+        manager.credentials()
+
+        assert creds.refresh_count == 0
+
+    def test_loads_token_file_once(self, make_manager):
+        creds = FakeCredentials(expires_in=timedelta(minutes=30))
+        manager, _ = make_manager(creds)
+
+        assert manager.credentials() is manager.credentials()
+        fetch_videos.Credentials.from_authorized_user_file.assert_called_once()
+
+    def test_concurrent_refreshes_are_serialized(self, make_manager):
+        creds = FakeCredentials(expires_in=timedelta(minutes=30), refresh_delay=0.2)
+        manager, token_path = make_manager(creds)
+        shared = manager.credentials()
+
+        # Simulate google-auth finding the token expired in several workers at once.
+        creds.expiry = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1)
+        threads = [threading.Thread(target=shared.refresh, args=(None,)) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert creds.refresh_count == 1
+        assert json.loads(token_path.read_text()) == {"token": "token-1"}
+
+    def test_late_refresh_reuses_fresh_token(self, make_manager):
+        creds = FakeCredentials(expires_in=timedelta(minutes=30))
+        manager, _ = make_manager(creds)
+        shared = manager.credentials()
+
+        # The second worker's request failed on the old token, but it only asks for a
+        # refresh after the first worker's refresh has already finished.
+        creds.expiry = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1)
+        for _ in range(2):
+            worker = threading.Thread(target=shared.refresh, args=(None,))
+            worker.start()
+            worker.join()
+
+        assert creds.refresh_count == 1
+        assert creds.token == "token-1"
+
+    def test_token_written_atomically(self, make_manager, tmp_path):
+        creds = FakeCredentials(expires_in=timedelta(seconds=0))
+        manager, token_path = make_manager(creds)
+
+        manager.credentials()
+
+        assert [p.name for p in tmp_path.iterdir()] == ["token.json"]
+
+
+# ---------------------------------------------------------------------------
+# Tests: build_client
+# ---------------------------------------------------------------------------
+
+class TestBuildClient:
+    def test_default_endpoint(self, monkeypatch):
+        monkeypatch.setattr(fetch_videos, "API_URL", None)
+        creds = MagicMock()
+        with patch("fetch_videos.build") as mock_build:
+            fetch_videos.build_client(creds)
+        mock_build.assert_called_once_with("youtube", "v3", credentials=creds)
+
+    def test_api_url_overrides_endpoint(self, monkeypatch):
+        monkeypatch.setattr(fetch_videos, "API_URL", "http://127.0.0.1:8080/youtube/v3/")
+        with patch("fetch_videos.build") as mock_build:
+            fetch_videos.build_client(MagicMock())
+        kwargs = mock_build.call_args[1]
+        assert kwargs["client_options"] == {"api_endpoint": "http://127.0.0.1:8080/youtube/v3/"}
 
 
 # ---------------------------------------------------------------------------
@@ -188,6 +340,28 @@ class TestGetAllVideoIds:
         result = fetch_videos.get_all_video_ids(youtube, "PLxxxxxxx")
         assert result == []
 
+    def test_stop_at_known_id_stops_paging(self):
+        youtube = make_youtube_mock()
+        page1 = self._make_page(["new1", "new2"], next_token="t1")
+        page2 = self._make_page(["new3", "known1", "known2"], next_token="t2")
+        page3 = self._make_page(["known3"])
+        youtube.playlistItems.return_value.list.return_value.execute.side_effect = [
+            page1, page2, page3
+        ]
+
+        result = fetch_videos.get_all_video_ids(
+            youtube, "PLxxxxxxx", stop_at={"known1", "known2", "known3"}
+        )
+
+        assert result == ["new1", "new2", "new3"]
+        assert youtube.playlistItems.return_value.list.call_count == 2
+
+    def test_stop_at_without_match_returns_everything(self):
+        youtube = make_youtube_mock()
+        youtube.playlistItems().list().execute.return_value = self._make_page(["vid1", "vid2"])
+        result = fetch_videos.get_all_video_ids(youtube, "PLxxxxxxx", stop_at={"other"})
+        assert result == ["vid1", "vid2"]
+
 
 # ---------------------------------------------------------------------------
 # Tests: get_video_details
@@ -300,19 +474,11 @@ class TestGetAllPlaylists:
 
 class TestGetPlaylistMemberships:
     def _make_video_item(self, video_id):
-        return {
-            "snippet": {
-                "resourceId": {"kind": "youtube#video", "videoId": video_id}
-            }
-        }
+        return {"contentDetails": {"videoId": video_id}}
 
     def _make_non_video_item(self):
-        """An item that is not a video (e.g. a playlist reference)."""
-        return {
-            "snippet": {
-                "resourceId": {"kind": "youtube#playlist", "playlistId": "PLother"}
-            }
-        }
+        """An item without a video ID in its contentDetails."""
+        return {"contentDetails": {}}
 
     def _make_playlist(self, playlist_id, title):
         return {"id": playlist_id, "snippet": {"title": title}}
@@ -327,11 +493,15 @@ class TestGetPlaylistMemberships:
         result = fetch_videos.get_playlist_memberships(youtube, playlists)
 
         assert len(result) == 1
-        assert result[0] == {
-            "playlist_id": "PL1",
-            "playlist_title": "My Playlist",
-            "video_id": "vid1",
-        }
+        assert result[0] == {"playlist_id": "PL1", "video_id": "vid1"}
+
+    def test_requests_content_details_only(self):
+        youtube = make_youtube_mock()
+        youtube.playlistItems().list().execute.return_value = {"items": []}
+
+        fetch_videos.get_playlist_memberships(youtube, [self._make_playlist("PL1", "P")])
+
+        assert youtube.playlistItems().list.call_args.kwargs["part"] == "contentDetails"
 
     def test_non_video_items_are_filtered_out(self):
         youtube = make_youtube_mock()
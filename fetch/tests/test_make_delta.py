@@ -0,0 +1,194 @@
+"""
+Unit tests for make_delta.py.
+
+Run with: python3 -m pytest fetch/tests/ (from repo root)
+         or: python3 -m pytest (from fetch/ directory)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import make_delta  # noqa: E402
+from make_delta import catalog_hashes, catalog_version, compute_delta, content_hash  # noqa: E402
+
+
+def make_video(video_id, title=None, view_count="1"):
+    return {"id": video_id, "title": title or f"Title {video_id}", "viewCount": view_count}
+
+
+class TestContentHash:
+    def test_independent_of_key_order(self):
+        a = {"id": "v1", "title": "T", "viewCount": "3"}
+        b = {"viewCount": "3", "title": "T", "id": "v1"}
+        assert content_hash(a) == content_hash(b)
+
+    def test_changes_with_content(self):
+        assert content_hash(make_video("v1", view_count="1")) != content_hash(
+            make_video("v1", view_count="2")
+        )
+
+
+class TestCatalogVersion:
+    def test_independent_of_order(self):
+        videos = [make_video("v1"), make_video("v2")]
+        assert catalog_version(catalog_hashes(videos)) == catalog_version(
+            catalog_hashes(list(reversed(videos)))
+        )
+
+    def test_changes_when_a_record_changes(self):
+        before = [make_video("v1"), make_video("v2")]
+        after = [make_video("v1"), make_video("v2", view_count="9")]
+        assert catalog_version(catalog_hashes(before)) != catalog_version(catalog_hashes(after))
+
+
+class TestComputeDelta:
+    def test_added_changed_removed(self):
+        previous = [make_video("v1"), make_video("v2"), make_video("v3")]
+        current = [make_video("v4"), make_video("v1"), make_video("v2", title="Renamed")]
+
+        delta = compute_delta(previous, current)
+
+        assert [v["id"] for v in delta["added"]] == ["v4"]
+        assert delta["changed"] == [make_video("v2", title="Renamed")]
+        assert delta["views"] == {}
+        assert delta["removed"] == ["v3"]
+
+    def test_identical_catalogs_produce_empty_delta(self):
+        videos = [make_video("v1"), make_video("v2")]
+        assert compute_delta(videos, list(videos)) == {
+            "added": [], "changed": [], "views": {}, "removed": [],
+        }
+
+    def test_empty_previous_adds_everything(self):
+        current = [make_video("v1"), make_video("v2")]
+        assert compute_delta([], current)["added"] == current
+
+    def test_view_count_only_changes_stay_compact(self):
+        previous = [
+            make_video(f"v{i}", title="A long title " * 20, view_count=str(i)) for i in range(200)
+        ]
+        current = [{**video, "viewCount": str(int(video["viewCount"]) + 1)} for video in previous]
+
+        delta = compute_delta(previous, current)
+
+        assert delta["changed"] == []
+        assert delta["views"] == {f"v{i}": str(i + 1) for i in range(200)}
+        assert len(json.dumps(delta)) < len(json.dumps(current)) / 10
+
+    def test_other_edits_ship_whole_records(self):
+        previous = [make_video("v1", view_count="1")]
+        current = [make_video("v1", title="Renamed", view_count="2")]
+        delta = compute_delta(previous, current)
+        assert delta["changed"] == current
+        assert delta["views"] == {}
+
+
+class TestMain:
+    @pytest.fixture
+    def paths(self, tmp_path, monkeypatch):
+        paths = {
+            "output": tmp_path / "videos.json",
+            "previous": tmp_path / "videos_previous.json",
+            "manifest": tmp_path / "manifest.json",
+            "previous_manifest": tmp_path / "manifest_previous.json",
+            "deltas": tmp_path / "deltas",
+        }
+        monkeypatch.setattr(make_delta, "OUTPUT_FILE", paths["output"])
+        monkeypatch.setattr(make_delta, "PREVIOUS_FILE", paths["previous"])
+        monkeypatch.setattr(make_delta, "MANIFEST_FILE", paths["manifest"])
+        monkeypatch.setattr(make_delta, "PREVIOUS_MANIFEST_FILE", paths["previous_manifest"])
+        monkeypatch.setattr(make_delta, "DELTAS_DIR", paths["deltas"])
+        return paths
+
+    def _build(self, paths, videos):
+        """Run make_delta.main() for `videos`, moving the last build into place like the workflow."""
+        if paths["output"].exists():
+            paths["output"].replace(paths["previous"])
+            paths["manifest"].replace(paths["previous_manifest"])
+        paths["output"].write_text(json.dumps(videos))
+        make_delta.main()
+        return json.loads(paths["manifest"].read_text())
+
+    def test_writes_manifest_and_delta(self, paths):
+        previous = [make_video("v1"), make_video("v2")]
+        current = [make_video("v3"), make_video("v1", title="Renamed")]
+        paths["previous"].write_text(json.dumps(previous))
+        paths["output"].write_text(json.dumps(current))
+
+        make_delta.main()
+
+        manifest = json.loads(paths["manifest"].read_text())
+        previous_version = catalog_version(catalog_hashes(previous))
+        assert manifest["format"] == make_delta.MANIFEST_FORMAT
+        assert manifest["count"] == 2
+        assert manifest["version"] == catalog_version(catalog_hashes(current))
+        assert manifest["deltas"] == [{
+            "from": previous_version,
+            "to": manifest["version"],
+            "file": f"deltas/{previous_version}.json",
+        }]
+        delta = json.loads((paths["deltas"] / f"{previous_version}.json").read_text())
+        assert delta["from"] == previous_version
+        assert delta["to"] == manifest["version"]
+        assert [v["id"] for v in delta["added"]] == ["v3"]
+        assert [v["id"] for v in delta["changed"]] == ["v1"]
+        assert delta["removed"] == ["v2"]
+
+    def test_chains_deltas_across_builds(self, paths):
+        versions = []
+        for views in range(4):
+            manifest = self._build(paths, [make_video("v1", view_count=str(views))])
+            versions.append(manifest["version"])
+
+        assert [(d["from"], d["to"]) for d in manifest["deltas"]] == list(zip(versions, versions[1:]))
+        assert len(list(paths["deltas"].glob("*.json"))) == 3
+
+    def test_chain_is_capped(self, paths, monkeypatch):
+        monkeypatch.setattr(make_delta, "MAX_DELTAS", 2)
+        for views in range(5):
+            manifest = self._build(paths, [make_video("v1", view_count=str(views))])
+
+        assert len(manifest["deltas"]) == 2
+        assert manifest["deltas"][-1]["to"] == manifest["version"]
+        assert sorted(p.name for p in paths["deltas"].glob("*.json")) == sorted(
+            d["file"].split("/")[1] for d in manifest["deltas"]
+        )
+
+    def test_broken_chain_is_dropped(self, paths):
+        self._build(paths, [make_video("v1", view_count="1")])
+        self._build(paths, [make_video("v1", view_count="2")])
+        for path in paths["deltas"].glob("*.json"):
+            path.unlink()
+
+        manifest = self._build(paths, [make_video("v1", view_count="3")])
+
+        assert len(manifest["deltas"]) == 1
+
+    def test_no_previous_build_writes_manifest_without_delta(self, paths):
+        paths["output"].write_text(json.dumps([make_video("v1")]))
+        paths["deltas"].mkdir()
+        (paths["deltas"] / "stale.json").write_text("{}")
+
+        make_delta.main()
+
+        assert json.loads(paths["manifest"].read_text())["deltas"] == []
+        assert list(paths["deltas"].glob("*.json")) == []
+
+    def test_unchanged_catalog_writes_no_delta(self, paths):
+        videos = [make_video("v1")]
+        paths["previous"].write_text(json.dumps(videos))
+        paths["output"].write_text(json.dumps(videos))
+
+        make_delta.main()
+
+        assert json.loads(paths["manifest"].read_text())["deltas"] == []
+        assert not paths["deltas"].exists()
+
+    def test_raises_if_output_missing(self, paths):
+        with pytest.raises(FileNotFoundError, match="videos.json"):
+            make_delta.main()
@@ -14,7 +14,12 @@ import pytest
 # Add the fetch/ directory to the path so we can import the module under test
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from make_simple_video_list import build_membership_lookup, simplify_video
+from make_simple_video_list import (
+    build_membership_lookup,
+    project_list,
+    simplify_all,
+    simplify_video,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -41,6 +46,8 @@ def make_raw_video(
     view_count="100",
     high_thumb=None,
     standard_thumb=None,
+    like_count=None,
+    duration=None,
 ):
     """Build a minimal raw YouTube API video resource."""
     thumbnails = {}
@@ -69,6 +76,10 @@ def make_raw_video(
         video["snippet"]["tags"] = tags
     if category_id is not None:
         video["snippet"]["categoryId"] = category_id
+    if like_count is not None:
+        video["statistics"]["likeCount"] = like_count
+    if duration is not None:
+        video["contentDetails"] = {"duration": duration}
 
     return video
 
@@ -118,12 +129,53 @@ class TestBuildMembershipLookup:
         # The defaultdict behavior: accessing missing key returns []
         assert result["vid_missing"] == []
 
+    def test_playlist_refs_are_shared_between_videos(self):
+        memberships = [
+            make_membership("vid1", "PL1", "Shared"),
+            make_membership("vid2", "PL1", "Shared"),
+        ]
+        result = build_membership_lookup({"memberships": memberships})
+        assert result["vid1"][0] is result["vid2"][0]
+
     def test_preserves_playlist_title(self):
         title = "Family & Friends — Summer 2024"
         memberships = [make_membership("vid1", "PL99", title)]
         result = build_membership_lookup({"memberships": memberships})
         assert result["vid1"][0]["title"] == title
 
+    def test_joins_titles_from_playlist_table(self):
+        playlists_full = {
+            "playlists": [
+                {"id": "PL1", "snippet": {"title": "Playlist One"}},
+                {"id": "PL2", "snippet": {"title": "Playlist Two"}},
+            ],
+            "memberships": [
+                {"playlist_id": "PL1", "video_id": "vid1"},
+                {"playlist_id": "PL2", "video_id": "vid1"},
+                {"playlist_id": "PL1", "video_id": "vid2"},
+            ],
+        }
+        result = build_membership_lookup(playlists_full)
+        assert result["vid1"] == [
+            {"id": "PL1", "title": "Playlist One"},
+            {"id": "PL2", "title": "Playlist Two"},
+        ]
+        assert result["vid2"][0] is result["vid1"][0]
+
+    def test_playlist_table_title_wins_over_row_title(self):
+        playlists_full = {
+            "playlists": [{"id": "PL1", "snippet": {"title": "Renamed"}}],
+            "memberships": [make_membership("vid1", "PL1", "Old name")],
+        }
+        assert build_membership_lookup(playlists_full)["vid1"][0]["title"] == "Renamed"
+
+    def test_rows_for_unknown_playlists_are_skipped(self):
+        playlists_full = {
+            "playlists": [],
+            "memberships": [{"playlist_id": "PLgone", "video_id": "vid1"}],
+        }
+        assert build_membership_lookup(playlists_full)["vid1"] == []
+
 
 # ---------------------------------------------------------------------------
 # Tests for simplify_video
@@ -321,3 +373,123 @@ class TestMainIntegration:
 
         with pytest.raises(FileNotFoundError, match="playlists_full.json"):
             msl.main()
+
+
+# ---------------------------------------------------------------------------
+# Tests for simplify_all
+# ---------------------------------------------------------------------------
+
+class TestSimplifyAll:
+    def _videos(self, count):
+        statuses = ("public", "unlisted", "private")
+        return [
+            make_raw_video(video_id=f"vid{i}", privacy_status=statuses[i % 3], high_thumb=THUMB_HIGH)
+            for i in range(count)
+        ]
+
+    def test_routes_public_and_private_in_order(self):
+        public, private = simplify_all(self._videos(6), {})
+        assert [v["id"] for v in public] == ["vid0", "vid1", "vid3", "vid4"]
+        assert [v["id"] for v in private] == ["vid2", "vid5"]
+
+    def test_parallel_matches_sequential(self, monkeypatch):
+        import make_simple_video_list as msl
+
+        monkeypatch.setattr(msl, "PARALLEL_THRESHOLD", 0)
+        videos = self._videos(50)
+        lookup = build_membership_lookup({"memberships": [
+            make_membership("vid7", "PL1", "One"),
+            make_membership("vid8", "PL1", "One"),
+        ]})
+
+        assert simplify_all(videos, lookup, workers=3) == simplify_all(videos, lookup, workers=1)
+
+    def test_small_inputs_stay_in_process(self, monkeypatch):
+        import make_simple_video_list as msl
+
+        monkeypatch.setattr(msl, "ProcessPoolExecutor", None)
+        public, private = simplify_all(self._videos(3), {}, workers=4)
+        assert len(public) + len(private) == 3
+
+
+# ---------------------------------------------------------------------------
+# Tests for output projections
+# ---------------------------------------------------------------------------
+
+class TestProjectList:
+    def test_truncates_long_description(self):
+        video = simplify_video(make_raw_video(description="x" * 500), {})
+        result = project_list(video)
+        assert result["description"] == "x" * 200 + "…"
+        assert result["hasDetail"] is True
+
+    def test_keeps_short_description(self):
+        video = simplify_video(make_raw_video(description="short"), {})
+        result = project_list(video)
+        assert result["description"] == "short"
+        assert "searchText" not in result
+
+    def test_truncated_description_stays_searchable(self):
+        description = "Intro. " * 40 + "Opening\n\nPresents at https://example.com/album?id=1 Grandma's"
+        video = simplify_video(make_raw_video(description=description), {})
+        search_text = project_list(video)["searchText"]
+        assert search_text == "intro. opening presents at grandma's"
+
+    def test_keeps_the_thumbnail_the_card_renders(self):
+        video = simplify_video(
+            make_raw_video(high_thumb=THUMB_HIGH, standard_thumb=THUMB_STANDARD), {}
+        )
+        assert project_list(video)["thumbnails"] == {"high": None, "standard": THUMB_STANDARD}
+
+    def test_falls_back_to_high_thumbnail(self):
+        video = simplify_video(make_raw_video(high_thumb=THUMB_HIGH), {})
+        assert project_list(video)["thumbnails"] == {"high": None, "standard": THUMB_HIGH}
+
+    def test_is_idempotent(self):
+        video = simplify_video(make_raw_video(description="y" * 300, high_thumb=THUMB_HIGH), {})
+        once = project_list(video)
+        assert project_list(once) == once
+
+
+class TestWriteOutputsSlim:
+    @pytest.fixture
+    def slim(self, tmp_path, monkeypatch):
+        import make_simple_video_list as msl
+
+        monkeypatch.setattr(msl, "PROJECTION", "slim")
+        monkeypatch.setattr(msl, "OUTPUT_FILE", tmp_path / "videos.json")
+        monkeypatch.setattr(msl, "PRIVATE_FILE", tmp_path / "videos_private.json")
+        monkeypatch.setattr(msl, "DETAILS_DIR", tmp_path / "details")
+        return msl, tmp_path
+
+    def test_writes_slim_list_and_public_details(self, slim):
+        msl, tmp_path = slim
+        public = [simplify_video(make_raw_video(video_id="pub1", description="z" * 400), {})]
+        private = [simplify_video(make_raw_video(video_id="priv1", privacy_status="private"), {})]
+
+        msl.write_outputs(public, private)
+
+        listed = json.loads((tmp_path / "videos.json").read_text())
+        assert listed == [project_list(public[0])]
+        assert json.loads((tmp_path / "details" / "pub1.json").read_text()) == public[0]
+        assert not (tmp_path / "details" / "priv1.json").exists()
+        assert json.loads((tmp_path / "videos_private.json").read_text()) == private
+
+    def test_rewriting_projections_keeps_existing_details(self, slim):
+        msl, tmp_path = slim
+        old = simplify_video(make_raw_video(video_id="old", description="full text"), {})
+        msl.write_outputs([old, simplify_video(make_raw_video(video_id="gone"), {})], [])
+
+        new = simplify_video(make_raw_video(video_id="new"), {})
+        listed = json.loads((tmp_path / "videos.json").read_text())
+        msl.write_outputs([new, listed[0]], [])
+
+        assert json.loads((tmp_path / "details" / "old.json").read_text()) == old
+        assert (tmp_path / "details" / "new.json").exists()
+        assert not (tmp_path / "details" / "gone.json").exists()
+
+    def test_unknown_projection_raises(self, slim, monkeypatch):
+        msl, _ = slim
+        monkeypatch.setattr(msl, "PROJECTION", "tiny")
+        with pytest.raises(ValueError, match="OUTPUT_PROJECTION"):
+            msl.write_outputs([], [])
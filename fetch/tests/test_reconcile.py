@@ -0,0 +1,193 @@
+"""
+Unit tests for reconcile.py.
+
+The YouTube client is replaced by synthetic_data.FakeYouTube, so no network access
+or credentials are required. Run with: python3 -m pytest fetch/tests/ (from repo root)
+"""
+
+import copy
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+for _mod in [
+    "google",
+    "google.auth",
+    "google.auth.credentials",
+    "google.auth.transport",
+    "google.auth.transport.requests",
+    "google.oauth2",
+    "google.oauth2.credentials",
+    "googleapiclient",
+    "googleapiclient.discovery",
+]:
+    sys.modules.setdefault(_mod, MagicMock())
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import reconcile  # noqa: E402
+from reconcile import diff_ids, get_uploads_privacy, reconcile_catalog  # noqa: E402
+from synthetic_data import UPLOADS_PLAYLIST_ID, FakeYouTube, make_channel  # noqa: E402
+
+NOW = "2026-01-01T00:00:00+00:00"
+
+
+def make_api(videos, uploads=None):
+    """FakeYouTube serving `videos`, with an uploads playlist of `uploads` (default: all)."""
+    api = FakeYouTube({"videos": videos, "playlists": [], "playlist_items": {}})
+    if uploads is not None:
+        api._uploads = uploads
+    return api
+
+
+def privacy_of(videos):
+    """{video_id: privacyStatus} as get_uploads_privacy would return it for `videos`."""
+    return {v["id"]: v["status"]["privacyStatus"] for v in videos}
+
+
+def set_privacy(video, status):
+    video = copy.deepcopy(video)
+    video["status"]["privacyStatus"] = status
+    return video
+
+
+class TestDiffIds:
+    def test_new_and_missing(self):
+        new_ids, missing_ids = diff_ids(["a", "b", "c"], ["d", "a", "c"])
+        assert new_ids == ["d"]
+        assert missing_ids == ["b"]
+
+    def test_identical(self):
+        assert diff_ids(["a", "b"], ["a", "b"]) == ([], [])
+
+
+class TestGetUploadsPrivacy:
+    def test_reads_privacy_from_playlist_items(self):
+        videos = make_channel(60, 0)["videos"]
+        videos[3] = set_privacy(videos[3], "private")
+        api = make_api(videos)
+
+        assert get_uploads_privacy(api, UPLOADS_PLAYLIST_ID) == privacy_of(videos)
+        assert api.request_count == 2
+
+
+class TestReconcileCatalog:
+    @pytest.fixture
+    def stored(self):
+        videos = make_channel(5, 0)["videos"]
+        return [set_privacy(v, "public") for v in videos]
+
+    def test_unchanged_catalog_makes_no_detail_requests(self, stored):
+        api = make_api(stored)
+        videos, tombstones = reconcile_catalog(api, stored, privacy_of(stored), NOW)
+        assert videos == stored
+        assert tombstones == []
+        assert api.request_count == 0
+
+    def test_new_videos_are_fetched_and_prepended(self, stored):
+        new_video = make_channel(6, 0, seed=1)["videos"][5]
+        api = make_api([new_video] + stored)
+        current = privacy_of([new_video] + stored)
+
+        videos, tombstones = reconcile_catalog(api, stored, current, NOW)
+
+        assert videos[0] == new_video
+        assert videos[1:] == stored
+        assert tombstones == []
+
+    def test_deleted_video_gets_tombstone(self, stored):
+        deleted = stored[2]
+        remaining = [v for v in stored if v is not deleted]
+        api = make_api(remaining)
+
+        videos, tombstones = reconcile_catalog(api, stored, privacy_of(remaining), NOW)
+
+        assert videos == remaining
+        assert tombstones == [{"id": deleted["id"], "reason": "deleted", "detectedAt": NOW}]
+
+    def test_video_no_longer_listed_and_private_gets_tombstone_and_is_kept(self, stored):
+        privatized = set_privacy(stored[1], "private")
+        remaining = [v for v in stored if v["id"] != privatized["id"]]
+        api = make_api(remaining + [privatized], uploads=[v["id"] for v in remaining])
+
+        videos, tombstones = reconcile_catalog(api, stored, privacy_of(remaining), NOW)
+
+        assert videos[-1] == privatized
+        assert tombstones == [{"id": privatized["id"], "reason": "private", "detectedAt": NOW}]
+
+    def test_video_made_private_in_uploads_is_detected(self, stored):
+        # The owner's uploads playlist keeps listing videos after they are made private.
+        privatized = set_privacy(stored[1], "private")
+        current = [privatized if v["id"] == privatized["id"] else v for v in stored]
+        api = make_api(current)
+
+        videos, tombstones = reconcile_catalog(
+            api, stored, get_uploads_privacy(api, UPLOADS_PLAYLIST_ID), NOW
+        )
+
+        assert videos == current
+        assert videos[1]["status"]["privacyStatus"] == "private"
+        assert tombstones == [{"id": privatized["id"], "reason": "private", "detectedAt": NOW}]
+
+    def test_privacy_change_not_to_private_refreshes_without_tombstone(self, stored):
+        unlisted = set_privacy(stored[0], "unlisted")
+        current = [unlisted] + stored[1:]
+        api = make_api(current)
+        api.list_videos = MagicMock(wraps=api.list_videos)
+
+        videos, tombstones = reconcile_catalog(api, stored, privacy_of(current), NOW)
+
+        assert videos == current
+        assert tombstones == []
+        assert api.list_videos.call_args[1]["id"] == unlisted["id"]
+
+    def test_only_ambiguous_and_new_ids_are_requested(self, stored):
+        remaining = stored[1:]
+        api = make_api(remaining)
+        api.list_videos = MagicMock(wraps=api.list_videos)
+
+        reconcile_catalog(api, stored, privacy_of(remaining), NOW)
+
+        api.list_videos.assert_called_once()
+        assert api.list_videos.call_args[1]["id"] == stored[0]["id"]
+
+
+class TestMain:
+    def test_rewrites_catalog_and_appends_tombstones(self, tmp_path, monkeypatch):
+        stored = make_channel(3, 0)["videos"]
+        videos_full = tmp_path / "videos_full.json"
+        tombstones_file = tmp_path / "tombstones.json"
+        videos_full.write_text(json.dumps(stored))
+        tombstones_file.write_text(json.dumps([{"id": "old", "reason": "deleted", "detectedAt": NOW}]))
+        monkeypatch.setattr(reconcile, "VIDEOS_FULL_FILE", videos_full)
+        monkeypatch.setattr(reconcile, "TOMBSTONES_FILE", tombstones_file)
+        monkeypatch.setattr(reconcile, "get_credentials", MagicMock())
+        monkeypatch.setattr(reconcile, "build_client", MagicMock(return_value=make_api(stored[1:])))
+
+        reconcile.main()
+
+        assert json.loads(videos_full.read_text()) == stored[1:]
+        history = json.loads(tombstones_file.read_text())
+        assert [t["id"] for t in history] == ["old", stored[0]["id"]]
+
+    def test_no_tombstones_leaves_history_alone(self, tmp_path, monkeypatch, capsys):
+        stored = make_channel(3, 0)["videos"]
+        videos_full = tmp_path / "videos_full.json"
+        videos_full.write_text(json.dumps(stored))
+        monkeypatch.setattr(reconcile, "VIDEOS_FULL_FILE", videos_full)
+        monkeypatch.setattr(reconcile, "TOMBSTONES_FILE", tmp_path / "tombstones.json")
+        monkeypatch.setattr(reconcile, "get_credentials", MagicMock())
+        monkeypatch.setattr(reconcile, "build_client", MagicMock(return_value=make_api(stored)))
+
+        reconcile.main()
+
+        assert not (tmp_path / "tombstones.json").exists()
+        assert "Recorded" not in capsys.readouterr().out
+
+    def test_raises_if_catalog_missing(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(reconcile, "VIDEOS_FULL_FILE", tmp_path / "videos_full.json")
+        with pytest.raises(FileNotFoundError, match="videos_full.json"):
+            reconcile.main()
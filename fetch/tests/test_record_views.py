@@ -0,0 +1,173 @@
+"""
+Unit tests for record_views.py.
+
+Run with: python3 -m pytest fetch/tests/ (from repo root)
+         or: python3 -m pytest (from fetch/ directory)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import record_views  # noqa: E402
+from record_views import DAY, connect, downsample, rankings, record  # noqa: E402
+
+NOW = 1_700_000_000
+
+
+@pytest.fixture
+def conn():
+    conn = connect(":memory:")
+    yield conn
+    conn.close()
+
+
+def samples(conn, video_id):
+    return conn.execute(
+        "SELECT ts, view_count FROM view_counts WHERE video_id = ? ORDER BY ts", (video_id,)
+    ).fetchall()
+
+
+class TestRecord:
+    def test_first_run_records_every_video(self, conn):
+        assert record(conn, {"v1": 10, "v2": 20}, NOW) == 2
+        assert samples(conn, "v1") == [(NOW, 10)]
+
+    def test_only_changed_counts_are_appended(self, conn):
+        record(conn, {"v1": 10, "v2": 20}, NOW)
+        assert record(conn, {"v1": 10, "v2": 25}, NOW + DAY) == 1
+        assert samples(conn, "v1") == [(NOW, 10)]
+        assert samples(conn, "v2") == [(NOW, 20), (NOW + DAY, 25)]
+
+    def test_latest_tracks_most_recent_sample(self, conn):
+        record(conn, {"v1": 10}, NOW)
+        record(conn, {"v1": 15}, NOW + DAY)
+        assert conn.execute("SELECT ts, view_count FROM latest").fetchall() == [(NOW + DAY, 15)]
+
+
+class TestDownsample:
+    def test_keeps_recent_samples(self, conn):
+        for day in range(5):
+            record(conn, {"v1": day}, NOW - day * DAY)
+        assert downsample(conn, NOW) == 0
+        assert len(samples(conn, "v1")) == 5
+
+    def test_thins_old_samples_to_one_per_week(self, conn):
+        start = NOW - 200 * DAY
+        for day in range(28):
+            record(conn, {"v1": day}, start + day * DAY)
+        downsample(conn, NOW)
+        kept = samples(conn, "v1")
+        assert 4 <= len(kept) <= 5
+        # The last sample of the old range always survives.
+        assert kept[-1] == (start + 27 * DAY, 27)
+
+
+class TestRankings:
+    def test_ranks_by_gain_and_growth(self, conn):
+        record(conn, {"big": 10_000, "small": 100}, NOW - 10 * DAY)
+        record(conn, {"big": 10_500, "small": 300}, NOW)
+        ranked = rankings(conn, NOW, {"big", "small"})
+        assert [e["id"] for e in ranked["trending"]] == ["big", "small"]
+        assert [e["id"] for e in ranked["fastestGrowing"]] == ["small", "big"]
+        assert ranked["trending"][0]["gain"] == 500
+
+    def test_baseline_is_count_at_window_start(self, conn):
+        record(conn, {"v1": 100}, NOW - 30 * DAY)
+        record(conn, {"v1": 150}, NOW - 3 * DAY)
+        record(conn, {"v1": 160}, NOW)
+        entry = rankings(conn, NOW, {"v1"})["trending"][0]
+        assert entry["baseline"] == 100
+        assert entry["gain"] == 60
+
+    def test_videos_first_seen_in_window_use_first_sample(self, conn):
+        record(conn, {"new": 50}, NOW - DAY)
+        record(conn, {"new": 80}, NOW)
+        assert rankings(conn, NOW, {"new"})["trending"][0]["gain"] == 30
+
+    def test_excludes_ineligible_and_unchanged(self, conn):
+        record(conn, {"private": 1, "flat": 5}, NOW - 10 * DAY)
+        record(conn, {"private": 999, "flat": 5}, NOW)
+        assert rankings(conn, NOW, {"flat"})["trending"] == []
+
+    def test_tiny_baselines_left_out_of_growth_ranking(self, conn):
+        record(conn, {"v1": 1}, NOW - 10 * DAY)
+        record(conn, {"v1": 9}, NOW)
+        ranked = rankings(conn, NOW, {"v1"})
+        assert len(ranked["trending"]) == 1
+        assert ranked["fastestGrowing"] == []
+
+
+class TestMain:
+    def _video(self, video_id, views, privacy="public"):
+        return {
+            "id": video_id,
+            "status": {"privacyStatus": privacy},
+            "statistics": {"viewCount": str(views)},
+        }
+
+    def test_missing_input_raises(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(record_views, "VIDEOS_FULL_FILE", tmp_path / "missing.json")
+        with pytest.raises(FileNotFoundError):
+            record_views.main([])
+
+    def test_writes_history_and_trending(self, tmp_path, monkeypatch):
+        videos_full = tmp_path / "videos_full.json"
+        videos_full.write_text(json.dumps([
+            self._video("pub", 10), self._video("priv", 20, "private"),
+        ]))
+        monkeypatch.setattr(record_views, "VIDEOS_FULL_FILE", videos_full)
+        monkeypatch.setattr(record_views, "HISTORY_DB", tmp_path / "history.sqlite3")
+        monkeypatch.setattr(record_views, "TRENDING_FILE", tmp_path / "trending.json")
+
+        record_views.main([])
+        conn = connect(tmp_path / "history.sqlite3")
+        # Push the first run's samples back so the second run shows a gain.
+        with conn:
+            conn.execute("UPDATE view_counts SET ts = ts - 10 * ?", (DAY,))
+            conn.execute("UPDATE latest SET ts = ts - 10 * ?", (DAY,))
+        conn.close()
+        videos_full.write_text(json.dumps([
+            self._video("pub", 50), self._video("priv", 90, "private"),
+        ]))
+        record_views.main([])
+
+        trending = json.loads((tmp_path / "trending.json").read_text())
+        assert trending["windowDays"] == record_views.TRENDING_WINDOW_DAYS
+        assert [e["id"] for e in trending["trending"]] == ["pub"]
+        assert trending["trending"][0]["gain"] == 40
+
+    def test_rank_only_reuses_history_without_recording(self, tmp_path, monkeypatch):
+        history = tmp_path / "history.sqlite3"
+        conn = connect(history)
+        record(conn, {"pub": 10, "priv": 20}, NOW - 10 * DAY)
+        record(conn, {"pub": 50, "priv": 90}, NOW - DAY)
+        conn.close()
+        # videos.json lists only public and unlisted videos; "added" has no history yet.
+        (tmp_path / "videos.json").write_text(json.dumps([{"id": "pub"}, {"id": "added"}]))
+        monkeypatch.setattr(record_views, "VIDEOS_FULL_FILE", tmp_path / "missing.json")
+        monkeypatch.setattr(record_views, "VIDEOS_FILE", tmp_path / "videos.json")
+        monkeypatch.setattr(record_views, "HISTORY_DB", history)
+        monkeypatch.setattr(record_views, "TRENDING_FILE", tmp_path / "trending.json")
+        monkeypatch.setattr(record_views.time, "time", lambda: NOW)
+
+        record_views.main(["--rank-only"])
+
+        trending = json.loads((tmp_path / "trending.json").read_text())
+        assert [(e["id"], e["gain"]) for e in trending["trending"]] == [("pub", 40)]
+        conn = connect(history)
+        assert len(conn.execute("SELECT * FROM view_counts").fetchall()) == 4
+        conn.close()
+
+    def test_rank_only_without_history_writes_nothing(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(record_views, "HISTORY_DB", tmp_path / "history.sqlite3")
+        monkeypatch.setattr(record_views, "TRENDING_FILE", tmp_path / "trending.json")
+
+        record_views.main(["--rank-only"])
+
+        assert not (tmp_path / "trending.json").exists()
+        assert not (tmp_path / "history.sqlite3").exists()
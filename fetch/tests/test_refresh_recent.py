@@ -0,0 +1,108 @@
+"""
+Unit tests for refresh_recent.py.
+
+The YouTube client is replaced by synthetic_data.FakeYouTube, so no network access
+or credentials are required. Run with: python3 -m pytest fetch/tests/ (from repo root)
+"""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+for _mod in [
+    "google",
+    "google.auth",
+    "google.auth.credentials",
+    "google.auth.transport",
+    "google.auth.transport.requests",
+    "google.oauth2",
+    "google.oauth2.credentials",
+    "googleapiclient",
+    "googleapiclient.discovery",
+]:
+    sys.modules.setdefault(_mod, MagicMock())
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import make_simple_video_list  # noqa: E402
+import refresh_recent  # noqa: E402
+from make_simple_video_list import simplify_all  # noqa: E402
+from synthetic_data import FakeYouTube, make_channel  # noqa: E402
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    paths = {
+        "videos_full": tmp_path / "videos_full.json",
+        "playlists_full": tmp_path / "playlists_full.json",
+        "videos": tmp_path / "videos.json",
+        "private": tmp_path / "videos_private.json",
+    }
+    monkeypatch.setattr(refresh_recent, "VIDEOS_FULL_FILE", paths["videos_full"])
+    monkeypatch.setattr(refresh_recent, "PLAYLISTS_FULL_FILE", paths["playlists_full"])
+    monkeypatch.setattr(make_simple_video_list, "OUTPUT_FILE", paths["videos"])
+    monkeypatch.setattr(make_simple_video_list, "PRIVATE_FILE", paths["private"])
+    monkeypatch.setattr(refresh_recent, "get_credentials", MagicMock())
+    return paths
+
+
+def setup_channel(paths, monkeypatch, total, known):
+    """Channel of `total` videos (newest first) where the oldest `known` are already built."""
+    channel = make_channel(total, 0)
+    existing = channel["videos"][total - known:]
+    public, private = simplify_all(existing, {})
+    paths["videos"].write_text(json.dumps(public))
+    paths["private"].write_text(json.dumps(private))
+    api = FakeYouTube(channel)
+    monkeypatch.setattr(refresh_recent, "build_client", MagicMock(return_value=api))
+    return channel, api
+
+
+class TestMain:
+    def test_prepends_only_new_videos(self, paths, monkeypatch):
+        channel, _ = setup_channel(paths, monkeypatch, total=10, known=7)
+        paths["playlists_full"].write_text(json.dumps({
+            "playlists": [],
+            "memberships": [{"video_id": channel["videos"][0]["id"], "playlist_id": "PL1", "playlist_title": "New"}],
+        }))
+
+        refresh_recent.main()
+
+        expected_public, expected_private = simplify_all(channel["videos"], {})
+        public = json.loads(paths["videos"].read_text())
+        private = json.loads(paths["private"].read_text())
+        assert [v["id"] for v in public] == [v["id"] for v in expected_public]
+        assert [v["id"] for v in private] == [v["id"] for v in expected_private]
+        newest = next(v for v in public + private if v["id"] == channel["videos"][0]["id"])
+        assert newest["playlists"] == [{"id": "PL1", "title": "New"}]
+
+    def test_stops_paging_at_first_known_video(self, paths, monkeypatch):
+        _, api = setup_channel(paths, monkeypatch, total=500, known=440)
+
+        refresh_recent.main()
+
+        # channels + 2 uploads pages (stops inside the second) + 2 videos.list batches
+        assert api.request_count == 5
+
+    def test_splices_raw_catalog_when_present(self, paths, monkeypatch):
+        channel, _ = setup_channel(paths, monkeypatch, total=4, known=3)
+        paths["videos_full"].write_text(json.dumps(channel["videos"][1:]))
+
+        refresh_recent.main()
+
+        assert json.loads(paths["videos_full"].read_text()) == channel["videos"]
+
+    def test_no_new_videos_leaves_outputs_alone(self, paths, monkeypatch):
+        setup_channel(paths, monkeypatch, total=3, known=3)
+        before = paths["videos"].read_text()
+
+        refresh_recent.main()
+
+        assert paths["videos"].read_text() == before
+
+    def test_raises_if_no_existing_output(self, paths):
+        with pytest.raises(FileNotFoundError, match="videos.json"):
+            refresh_recent.main()
@@ -0,0 +1,131 @@
+"""
+Unit tests for state_bundle.py.
+
+Run with: python3 -m pytest fetch/tests/ (from repo root)
+         or: python3 -m pytest (from fetch/ directory)
+"""
+
+import io
+import json
+import sys
+import tarfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import state_bundle  # noqa: E402
+from state_bundle import BundleError, collect_files, restore_bundle, save_bundle  # noqa: E402
+
+
+@pytest.fixture
+def state_dir(tmp_path):
+    root = tmp_path / "run1"
+    root.mkdir()
+    (root / "videos_full.json").write_text(json.dumps([{"id": "v1", "etag": "e1"}]))
+    (root / "view_history.sqlite3").write_bytes(b"\x00binary\xff")
+    # Shipped in the videos-json artifact instead of the bundle.
+    (root / "details").mkdir()
+    (root / "details" / "v1.json").write_text('{"id": "v1"}')
+    (root / "unrelated.txt").write_text("not state")
+    return root
+
+
+def rewrite_member(bundle, name, data):
+    """Copy `bundle` with the contents of one member replaced, keeping its manifest."""
+    with tarfile.open(bundle, "r:gz") as tar:
+        members = [(m, tar.extractfile(m).read()) for m in tar.getmembers()]
+    with tarfile.open(bundle, "w:gz") as tar:
+        for member, content in members:
+            if member.name == name:
+                content = data
+                member.size = len(data)
+            tar.addfile(member, io.BytesIO(content))
+
+
+class TestCollectFiles:
+    def test_lists_existing_state_files_only(self, state_dir):
+        assert collect_files(state_dir) == ["videos_full.json", "view_history.sqlite3"]
+
+
+class TestRoundTrip:
+    def test_restores_identical_files(self, state_dir, tmp_path):
+        bundle = tmp_path / "state.tar.gz"
+        manifest = save_bundle(bundle, state_dir)
+        assert manifest["format"] == state_bundle.BUNDLE_FORMAT
+        assert set(manifest["files"]) == set(collect_files(state_dir))
+
+        target = tmp_path / "run2"
+        target.mkdir()
+        restore_bundle(bundle, target)
+        for name in manifest["files"]:
+            assert (target / name).read_bytes() == (state_dir / name).read_bytes()
+        assert not (target / "unrelated.txt").exists()
+        # The staging directory is cleaned up.
+        assert sorted(p.name for p in target.iterdir()) == [
+            "videos_full.json", "view_history.sqlite3",
+        ]
+
+    def test_empty_state(self, tmp_path):
+        bundle = tmp_path / "state.tar.gz"
+        empty = tmp_path / "empty"
+        empty.mkdir()
+        assert save_bundle(bundle, empty)["files"] == {}
+        assert restore_bundle(bundle, empty)["files"] == {}
+
+
+class TestIntegrity:
+    def _restore_fails(self, bundle, tmp_path):
+        target = tmp_path / "target"
+        target.mkdir()
+        (target / "videos_full.json").write_text("old")
+        with pytest.raises(BundleError):
+            restore_bundle(bundle, target)
+        # Nothing was overwritten and no staging files were left behind.
+        assert [p.name for p in target.iterdir()] == ["videos_full.json"]
+        assert (target / "videos_full.json").read_text() == "old"
+
+    def test_checksum_mismatch(self, state_dir, tmp_path):
+        bundle = tmp_path / "state.tar.gz"
+        save_bundle(bundle, state_dir)
+        rewrite_member(bundle, "state/videos_full.json", b"tampered")
+        self._restore_fails(bundle, tmp_path)
+
+    def test_unknown_format(self, state_dir, tmp_path):
+        bundle = tmp_path / "state.tar.gz"
+        save_bundle(bundle, state_dir)
+        rewrite_member(bundle, "bundle.json", json.dumps({"format": 99, "files": {}}).encode())
+        self._restore_fails(bundle, tmp_path)
+
+    def test_truncated_bundle(self, state_dir, tmp_path):
+        bundle = tmp_path / "state.tar.gz"
+        save_bundle(bundle, state_dir)
+        bundle.write_bytes(bundle.read_bytes()[:-40])
+        self._restore_fails(bundle, tmp_path)
+
+    def test_rejects_paths_outside_root(self, tmp_path):
+        bundle = tmp_path / "state.tar.gz"
+        manifest = json.dumps({
+            "format": state_bundle.BUNDLE_FORMAT,
+            "files": {"../escape.json": {"size": 0, "sha256": ""}},
+        }).encode()
+        with tarfile.open(bundle, "w:gz") as tar:
+            info = tarfile.TarInfo("bundle.json")
+            info.size = len(manifest)
+            tar.addfile(info, io.BytesIO(manifest))
+        self._restore_fails(bundle, tmp_path)
+
+
+class TestMain:
+    def test_restore_without_bundle_starts_cold(self, tmp_path, capsys):
+        state_bundle.main(["restore", "--bundle", str(tmp_path / "missing.tar.gz")])
+        assert "starting cold" in capsys.readouterr().out
+
+    def test_save_and_restore(self, state_dir, tmp_path, monkeypatch):
+        bundle = tmp_path / "state.tar.gz"
+        monkeypatch.setattr(state_bundle, "HERE", state_dir)
+        state_bundle.main(["save", "--bundle", str(bundle)])
+        (state_dir / "videos_full.json").unlink()
+        state_bundle.main(["restore", "--bundle", str(bundle)])
+        assert json.loads((state_dir / "videos_full.json").read_text()) == [{"id": "v1", "etag": "e1"}]
@@ -0,0 +1,134 @@
+"""
+Unit tests for sync.py.
+
+External Google API dependencies are fully mocked so no network access or
+credentials are required. Run with:
+  python3 -m pytest fetch/tests/  (from repo root)
+"""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+for _mod in [
+    "google",
+    "google.auth",
+    "google.auth.credentials",
+    "google.auth.transport",
+    "google.auth.transport.requests",
+    "google.oauth2",
+    "google.oauth2.credentials",
+    "googleapiclient",
+    "googleapiclient.discovery",
+]:
+    sys.modules.setdefault(_mod, MagicMock())
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import export_columns  # noqa: E402
+import fetch_videos  # noqa: E402
+import make_simple_video_list  # noqa: E402
+import sync  # noqa: E402
+from tests.test_make_simple_video_list import make_raw_video  # noqa: E402
+
+
+@pytest.fixture
+def outputs(tmp_path, monkeypatch):
+    paths = {
+        "videos_full": tmp_path / "videos_full.json",
+        "playlists_full": tmp_path / "playlists_full.json",
+        "videos": tmp_path / "videos.json",
+        "private": tmp_path / "videos_private.json",
+    }
+    monkeypatch.setattr(fetch_videos, "OUTPUT_FILE", paths["videos_full"])
+    monkeypatch.setattr(fetch_videos, "PLAYLISTS_FILE", paths["playlists_full"])
+    monkeypatch.setattr(make_simple_video_list, "OUTPUT_FILE", paths["videos"])
+    monkeypatch.setattr(make_simple_video_list, "PRIVATE_FILE", paths["private"])
+    return paths
+
+
+class TestMain:
+    def _run(self, monkeypatch, video_pages, playlists, playlist_items):
+        # The main thread builds its client first; the playlist thread builds the second.
+        videos_client = MagicMock()
+        videos_client.channels().list().execute.return_value = {
+            "items": [{"contentDetails": {"relatedPlaylists": {"uploads": "UU1"}}}]
+        }
+        video_ids = [v["id"] for page in video_pages for v in page]
+        videos_client.playlistItems().list().execute.return_value = {
+            "items": [{"contentDetails": {"videoId": vid}} for vid in video_ids]
+        }
+        videos_client.videos().list().execute.side_effect = [
+            {"items": page} for page in video_pages
+        ]
+
+        playlists_client = MagicMock()
+        playlists_client.playlists().list().execute.return_value = {"items": playlists}
+        playlists_client.playlistItems().list().execute.side_effect = playlist_items
+
+        monkeypatch.setattr(sync, "get_credentials", MagicMock())
+        monkeypatch.setattr(sync, "build_client", MagicMock(side_effect=[videos_client, playlists_client]))
+        sync.main()
+
+    def test_writes_raw_and_simplified_outputs(self, monkeypatch, outputs):
+        video_pages = [[
+            make_raw_video(video_id="pub1"),
+            make_raw_video(video_id="unl1", privacy_status="unlisted"),
+            make_raw_video(video_id="priv1", privacy_status="private"),
+        ]]
+        playlists = [{"id": "PL1", "snippet": {"title": "My Playlist"}}]
+        playlist_items = [{
+            "items": [{"contentDetails": {"videoId": "pub1"}}]
+        }]
+
+        self._run(monkeypatch, video_pages, playlists, playlist_items)
+
+        assert json.loads(outputs["videos_full"].read_text()) == video_pages[0]
+        playlists_full = json.loads(outputs["playlists_full"].read_text())
+        assert playlists_full["playlists"] == playlists
+        assert len(playlists_full["memberships"]) == 1
+
+        public = json.loads(outputs["videos"].read_text())
+        private = json.loads(outputs["private"].read_text())
+        assert [v["id"] for v in public] == ["pub1", "unl1"]
+        assert [v["id"] for v in private] == ["priv1"]
+        assert public[0]["playlists"] == [{"id": "PL1", "title": "My Playlist"}]
+        assert public[1]["playlists"] == []
+
+    def test_matches_two_step_pipeline(self, monkeypatch, outputs):
+        video_pages = [
+            [make_raw_video(video_id=f"vid{i}") for i in range(50)],
+            [make_raw_video(video_id="vid50", privacy_status="private")],
+        ]
+        playlists = [{"id": "PL1", "snippet": {"title": "All"}}]
+        playlist_items = [{
+            "items": [
+                {"contentDetails": {"videoId": "vid50"}}
+            ]
+        }]
+
+        self._run(monkeypatch, video_pages, playlists, playlist_items)
+        public = outputs["videos"].read_text()
+        private = outputs["private"].read_text()
+
+        # Re-running the standalone transform over the raw files must give identical output.
+        monkeypatch.setattr(make_simple_video_list, "VIDEOS_FULL_FILE", outputs["videos_full"])
+        monkeypatch.setattr(make_simple_video_list, "PLAYLISTS_FULL_FILE", outputs["playlists_full"])
+        make_simple_video_list.main()
+
+        assert outputs["videos"].read_text() == public
+        assert outputs["private"].read_text() == private
+
+    def test_honors_export_columns(self, monkeypatch, outputs, tmp_path):
+        monkeypatch.setattr(make_simple_video_list, "EXPORT_COLUMNS", True)
+        monkeypatch.setattr(export_columns, "COLUMNS_DIR", tmp_path / "columns")
+        playlists = [{"id": "PL1", "snippet": {"title": "All"}}]
+        playlist_items = [{"items": [{"contentDetails": {"videoId": "pub1"}}]}]
+
+        self._run(monkeypatch, [[make_raw_video(video_id="pub1")]], playlists, playlist_items)
+
+        schema = json.loads((tmp_path / "columns" / "schema.json").read_text())
+        assert schema["tables"]["memberships"]["rows"] == 1
@@ -0,0 +1,94 @@
+"""
+Unit tests for synthetic_data.py and benchmark.py.
+
+Run with: python3 -m pytest fetch/tests/ (from repo root)
+         or: python3 -m pytest (from fetch/ directory)
+"""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+for _mod in [
+    "google",
+    "google.auth",
+    "google.auth.credentials",
+    "google.auth.transport",
+    "google.auth.transport.requests",
+    "google.oauth2",
+    "google.oauth2.credentials",
+    "googleapiclient",
+    "googleapiclient.discovery",
+]:
+    sys.modules.setdefault(_mod, MagicMock())
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import benchmark  # noqa: E402
+import fetch_videos  # noqa: E402
+from synthetic_data import UPLOADS_PLAYLIST_ID, FakeYouTube, make_channel  # noqa: E402
+
+
+class TestMakeChannel:
+    def test_sizes(self):
+        channel = make_channel(120, 7, memberships_per_video=2)
+        assert len(channel["videos"]) == 120
+        assert len(channel["playlists"]) == 7
+        assert sum(len(ids) for ids in channel["playlist_items"].values()) == 240
+
+    def test_deterministic_for_seed(self):
+        assert make_channel(30, 3, seed=5) == make_channel(30, 3, seed=5)
+
+    def test_no_playlists(self):
+        channel = make_channel(10, 0)
+        assert channel["playlist_items"] == {}
+
+
+class TestFakeYouTube:
+    def test_fetch_functions_page_through_dataset(self):
+        channel = make_channel(130, 60)
+        youtube = FakeYouTube(channel)
+
+        assert fetch_videos.get_uploads_playlist_id(youtube) == UPLOADS_PLAYLIST_ID
+        video_ids = fetch_videos.get_all_video_ids(youtube, UPLOADS_PLAYLIST_ID)
+        assert video_ids == [v["id"] for v in channel["videos"]]
+        assert fetch_videos.get_video_details(youtube, video_ids) == channel["videos"]
+
+        playlists = fetch_videos.get_all_playlists(youtube)
+        assert playlists == channel["playlists"]
+        memberships = fetch_videos.get_playlist_memberships(youtube, playlists)
+        assert len(memberships) == 260
+
+    def test_playlist_items_include_only_requested_parts(self):
+        youtube = FakeYouTube(make_channel(3, 0))
+        response = youtube.playlistItems().list(
+            playlistId=UPLOADS_PLAYLIST_ID, part="contentDetails"
+        ).execute()
+        assert set(response["items"][0]) == {"kind", "id", "contentDetails"}
+
+    def test_counts_requests(self):
+        youtube = FakeYouTube(make_channel(101, 0))
+        fetch_videos.get_all_video_ids(youtube, UPLOADS_PLAYLIST_ID)
+        assert youtube.request_count == 3
+
+
+class TestBenchmark:
+    def test_main_appends_run(self, tmp_path):
+        output = tmp_path / "results.json"
+        benchmark.main(["--sizes", "60", "--playlists", "3", "--output", str(output)])
+        benchmark.main(["--sizes", "60", "--playlists", "3", "--output", str(output)])
+
+        history = json.loads(output.read_text())
+        assert len(history) == 2
+        result = history[0]["results"][0]
+        assert result["videos"] == 60
+        assert result["memberships"] == 120
+        assert set(result["seconds"]) >= {
+            "get_video_details",
+            "get_playlist_memberships",
+            "build_membership_lookup",
+            "simplify_video",
+            "serialize_simplified",
+        }
+        assert set(result["peak_mib"]) == {"build_membership_lookup", "simplify_video"}
@@ -1,6 +1,96 @@
-import type { Video } from '$lib/types';
+import type { CatalogDelta, CatalogManifest, Video } from '$lib/types';
 import { base } from '$app/paths';
 
+const CACHE_KEY = 'videoCatalog';
+const MANIFEST_FORMAT = 2;
+
+interface CachedCatalog {
+	version: string;
+	videos: Video[];
+}
+
+async function fetchJson<T>(file: string): Promise<T> {
+	const res = await fetch(`${base}/${file}`, { cache: 'no-store' });
+	if (!res.ok) throw new Error(`Failed to fetch ${file}: ${res.status}`);
+	return res.json();
+}
+
+/** The manifest is optional: without one (older builds, local dev) the full catalog is fetched. */
+async function fetchManifest(): Promise<CatalogManifest | null> {
+	try {
+		const manifest = await fetchJson<CatalogManifest>('manifest.json');
+		return manifest.format === MANIFEST_FORMAT ? manifest : null;
+	} catch {
+		return null;
+	}
+}
+
+function readCache(): CachedCatalog | null {
+	try {
+		const raw = localStorage.getItem(CACHE_KEY);
+		return raw ? JSON.parse(raw) : null;
+	} catch {
+		return null;
+	}
+}
+
+function writeCache(catalog: CachedCatalog) {
+	try {
+		localStorage.setItem(CACHE_KEY, JSON.stringify(catalog));
+	} catch {
+		// Storage full or unavailable — the next visit simply fetches the full catalog.
+	}
+}
+
+export function applyDelta(videos: Video[], delta: CatalogDelta): Video[] {
+	const removed = new Set(delta.removed);
+	const changed = new Map(delta.changed.map((v) => [v.id, v]));
+	const views = delta.views ?? {};
+	const kept = videos
+		.filter((v) => !removed.has(v.id))
+		.map((v) => {
+			if (changed.has(v.id)) return changed.get(v.id)!;
+			return Object.hasOwn(views, v.id) ? { ...v, viewCount: views[v.id] } : v;
+		});
+	return [...delta.added, ...kept];
+}
+
+/** Patch `cached` up to the manifest's version using its delta chain, or return null. */
+async function patchCatalog(cached: CachedCatalog, manifest: CatalogManifest): Promise<Video[] | null> {
+	const start = manifest.deltas.findIndex((d) => d.from === cached.version);
+	if (start < 0) return null;
+	const chain = manifest.deltas.slice(start);
+	try {
+		const deltas = await Promise.all(chain.map((entry) => fetchJson<CatalogDelta>(entry.file)));
+		let videos = cached.videos;
+		for (const [i, delta] of deltas.entries()) {
+			if (delta.from !== chain[i].from || delta.to !== chain[i].to) return null;
+			videos = applyDelta(videos, delta);
+		}
+		const complete = chain[chain.length - 1].to === manifest.version;
+		return complete && videos.length === manifest.count ? videos : null;
+	} catch {
+		// Fall back to a full fetch.
+		return null;
+	}
+}
+
+async function loadCatalog(): Promise<Video[]> {
+	const manifest = await fetchManifest();
+	if (!manifest) return fetchJson<Video[]>('videos.json');
+
+	const cached = readCache();
+	let videos: Video[] | null = null;
+	if (cached?.version === manifest.version) {
+		videos = cached.videos;
+	} else if (cached) {
+		videos = await patchCatalog(cached, manifest);
+	}
+	videos ??= await fetchJson<Video[]>('videos.json');
+	writeCache({ version: manifest.version, videos });
+	return videos;
+}
+
 function createVideoStore() {
 	let videos = $state<Video[]>([]);
 	let loading = $state(true);
@@ -9,9 +99,7 @@ function createVideoStore() {
 	async function load() {
 		if (!loading && videos.length > 0) return;
 		try {
-			const res = await fetch(`${base}/videos.json`, { cache: 'no-store' });
-			if (!res.ok) throw new Error(`Failed to fetch videos: ${res.status}`);
-			videos = await res.json();
+			videos = await loadCatalog();
 		} catch (e) {
 			error = e instanceof Error ? e.message : 'Failed to load videos';
 		} finally {
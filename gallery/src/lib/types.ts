@@ -27,4 +27,28 @@ export interface Video {
 	playlists: PlaylistRef[];
 	videoDate?: string;
 	duration?: string;
+	/** Set on slim list records; the full record is at details/<id>.json. */
+	hasDetail?: boolean;
+	/** Slim records with a truncated description: its distinct lowercase words. */
+	searchText?: string;
+}
+
+/** manifest.json, written by fetch/make_delta.py alongside videos.json. */
+export interface CatalogManifest {
+	format: number;
+	version: string;
+	count: number;
+	/** Chain of patches ending at `version`, oldest first. */
+	deltas: { from: string; to: string; file: string }[];
+}
+
+/** Patch turning the catalog at version `from` into the catalog at version `to`. */
+export interface CatalogDelta {
+	from: string;
+	to: string;
+	added: Video[];
+	changed: Video[];
+	/** New view counts for records whose only change is their view count. */
+	views: Record<string, string>;
+	removed: string[];
 }
@@ -331,3 +331,162 @@ test.describe('Video detail page', () => {
 		await expect(page.getByText('Video not found.')).toBeVisible();
 	});
 });
+
+// ---------------------------------------------------------------------------
+// Incremental catalog updates (manifest.json + deltas/)
+// ---------------------------------------------------------------------------
+
+test.describe('Gallery page — incremental catalog updates', () => {
+	async function mockJson(page: Page, pattern: string, body: object) {
+		await page.route(pattern, async (route) => {
+			await route.fulfill({
+				status: 200,
+				contentType: 'application/json',
+				body: JSON.stringify(body),
+			});
+		});
+	}
+
+	async function seedCache(page: Page, version: string, videos: ReadonlyArray<object>) {
+		await page.addInitScript(
+			([v, vids]) => localStorage.setItem('videoCatalog', JSON.stringify({ version: v, videos: vids })),
+			[version, videos] as const,
+		);
+	}
+
+	test('applies the delta to a cached catalog instead of refetching videos.json', async ({ page }) => {
+		const [first, second, third] = sampleVideos;
+		await seedCache(page, 'v1', [first, second, third]);
+		await mockJson(page, '**/manifest.json', {
+			format: 2,
+			version: 'v2',
+			count: 2,
+			deltas: [{ from: 'v1', to: 'v2', file: 'deltas/v1.json' }],
+		});
+		await mockJson(page, '**/deltas/v1.json', {
+			from: 'v1',
+			to: 'v2',
+			added: [],
+			changed: [{ ...first, title: 'Renamed Vacation' }],
+			views: {},
+			removed: [third.id],
+		});
+		await mockVideosError(page, 500);
+		await page.goto('/');
+
+		await expect(page.getByText('Renamed Vacation')).toBeVisible();
+		await expect(page.getByText(second.title)).toBeVisible();
+		await expect(page.getByText(third.title)).toHaveCount(0);
+	});
+
+	test('applies a chain of deltas for clients several builds behind', async ({ page }) => {
+		const [first, second] = sampleVideos;
+		await seedCache(page, 'v1', [first, second]);
+		await mockJson(page, '**/manifest.json', {
+			format: 2,
+			version: 'v3',
+			count: 2,
+			deltas: [
+				{ from: 'v0', to: 'v1', file: 'deltas/v0.json' },
+				{ from: 'v1', to: 'v2', file: 'deltas/v1.json' },
+				{ from: 'v2', to: 'v3', file: 'deltas/v2.json' },
+			],
+		});
+		await mockJson(page, '**/deltas/v1.json', {
+			from: 'v1',
+			to: 'v2',
+			added: [],
+			changed: [{ ...first, title: 'Renamed Vacation' }],
+			views: {},
+			removed: [],
+		});
+		await mockJson(page, '**/deltas/v2.json', {
+			from: 'v2',
+			to: 'v3',
+			added: [],
+			changed: [{ ...second, title: 'Renamed Again' }],
+			views: { [first.id]: '999999' },
+			removed: [],
+		});
+		await mockVideosError(page, 500);
+		await page.goto('/');
+
+		await expect(page.getByText('Renamed Vacation')).toBeVisible();
+		await expect(page.getByText('Renamed Again')).toBeVisible();
+	});
+
+	test('falls back to videos.json when the cached version has no matching delta', async ({ page }) => {
+		await seedCache(page, 'stale', []);
+		await mockJson(page, '**/manifest.json', {
+			format: 2,
+			version: 'v2',
+			count: sampleVideos.length,
+			deltas: [{ from: 'v1', to: 'v2', file: 'deltas/v1.json' }],
+		});
+		await mockVideos(page);
+		await page.goto('/');
+
+		await expect(page.getByText(sampleVideos[0].title)).toBeVisible();
+	});
+});
+
+test.describe('Gallery page — slim list records', () => {
+	const [full, ...rest] = sampleVideos;
+	const slim = {
+		...full,
+		description: 'Our summer trip…',
+		thumbnails: { high: null, standard: full.thumbnails.standard },
+		hasDetail: true,
+		searchText: 'our summer trip to the beach. fun in the sun!',
+	};
+
+	test('search matches words past the truncated description', async ({ page }) => {
+		await mockVideos(page, [slim, ...rest]);
+		await page.goto('/');
+
+		await page.getByPlaceholder('Search videos...').fill('sun beach');
+		await expect(page.getByText(full.title)).toBeVisible();
+		await expect(page.locator('.grid [role="button"]')).toHaveCount(1);
+	});
+
+	test('card shows the standard thumbnail', async ({ page }) => {
+		await mockVideos(page, [slim]);
+		await page.goto('/');
+
+		await expect(page.getByAltText(full.title)).toHaveAttribute('src', full.thumbnails.standard.url);
+	});
+});
+
+test.describe('Video detail page — slim list records', () => {
+	test('loads the full record from details/<id>.json', async ({ page }) => {
+		const full = sampleVideos[0];
+		const slim = {
+			...full,
+			description: 'Our summer trip…',
+			thumbnails: { high: null, standard: full.thumbnails.standard },
+			hasDetail: true,
+		};
+		await mockVideos(page, [slim]);
+		await page.route(`**/details/${full.id}.json`, async (route) => {
+			await route.fulfill({
+				status: 200,
+				contentType: 'application/json',
+				body: JSON.stringify(full),
+			});
+		});
+		await page.goto(`/video/${full.id}`);
+
+		await expect(page.getByText(full.description)).toBeVisible();
+	});
+
+	test('falls back to the list record when the detail file is missing', async ({ page }) => {
+		const slim = { ...sampleVideos[0], description: 'Short version', hasDetail: true };
+		await mockVideos(page, [slim]);
+		await page.route('**/details/*.json', async (route) => {
+			await route.fulfill({ status: 404, body: 'Not Found' });
+		});
+		await page.goto(`/video/${slim.id}`);
+
+		await expect(page.getByText('Short version')).toBeVisible();
+	});
+});